@@ -4,8 +4,8 @@ import os
 from google.adk.agents import LlmAgent
 from google.adk.tools.agent_tool import AgentTool
 
-from . import prompt
-from .sub_agents.agri_analyzer_agent.agri_analyzer_agent import agri_analyzer_agent
+from . import intent_router, prompt, response_cache
+from .sub_agents.agri_analyzer_agent.agri_analyzer_agent import agri_analyzer_agent, get_crop_yield_prediction
 from .sub_agents.crop_suitability_agent.crop_suitability_agent import crop_suitability_agent
 from .sub_agents.grow_anyways_agent.grow_anyways_agent import grow_anyways_agent
 from .sub_agents.yield_improvement_agent.yield_improvement_agent import yield_improvement_agent
@@ -18,6 +18,18 @@ logger = logging.getLogger(__name__)
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
 DESCRIPTION = "Friendly farming assistant that helps farmers with crop cultivation decisions by collecting crop and location information, validating supported crops, and delegating to agricultural analysis tools"
 
+# --- Tool callbacks: fast-path router first, then the response cache ---
+
+async def before_tool_callback(tool, args, tool_context):
+    routed = await intent_router.before_tool_callback(tool, args, tool_context)
+    if routed is not None:
+        return routed
+    return await response_cache.before_tool_callback(tool, args, tool_context)
+
+async def after_tool_callback(tool, args, tool_context, tool_response):
+    intent_router.after_tool_callback(tool, args, tool_context, tool_response)
+    return await response_cache.after_tool_callback(tool, args, tool_context, tool_response)
+
 # --- Director Agent (root agent) ---
 
 if agri_analyzer_agent:
@@ -26,7 +38,13 @@ if agri_analyzer_agent:
         model=GEMINI_MODEL, 
         description=(DESCRIPTION),
         instruction=prompt.PUNGDE_AGENT_PROMPT,
-        tools=[AgentTool(agri_analyzer_agent), AgentTool(crop_suitability_agent), AgentTool(grow_anyways_agent), AgentTool(yield_improvement_agent), AgentTool(image_generator_agent), AgentTool(seed_identifier_agent)],
+        tools=[get_crop_yield_prediction, AgentTool(agri_analyzer_agent), AgentTool(crop_suitability_agent), AgentTool(grow_anyways_agent), AgentTool(yield_improvement_agent), AgentTool(image_generator_agent), AgentTool(seed_identifier_agent)],
+        # Structured requests skip the routing call and agri_analyzer_agent's LLM hops
+        before_model_callback=intent_router.before_model_callback,
+        after_model_callback=intent_router.after_model_callback,
+        # Serve repeated grow-anyways / yield-improvement / seed questions from the response cache
+        before_tool_callback=before_tool_callback,
+        after_tool_callback=after_tool_callback,
     )
     logger.info(f"✅ Agent '{root_agent.name}' created using model '{GEMINI_MODEL}'.")
 else:
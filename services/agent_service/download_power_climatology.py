@@ -0,0 +1,75 @@
+"""
+Pre-populates the NASA POWER climatology store for whole regions.
+
+Walks every POWER grid node (0.5° latitude x 0.625° longitude) whose cell overlaps the given
+bounding boxes, skips nodes already in the store and downloads the rest with a small worker
+pool. Point the agent at the result with
+NASA_POWER_CACHE_DB=<db>. Run from the services/ directory:
+
+    python -m agent_service.download_power_climatology --db power_climatology.db --region india
+    python -m agent_service.download_power_climatology --db power_climatology.db --bbox 18 21 73 77
+
+Set NASA_POWER_URL to the fake server (agent_service/fakes/fake_power.py) to try it offline.
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .nasa_power import (
+    AGROCLIMATE_PARAMETERS, POWER_LAT_STEP_DEG, POWER_LON_STEP_DEG, ClimatologyCache, cache_key, fetch_climatology_sync
+)
+
+# (min_lat, max_lat, min_lon, max_lon)
+REGIONS = {
+    "india": (6.5, 35.5, 68.0, 97.5),
+    "maharashtra": (15.5, 22.1, 72.6, 80.9)
+}
+
+def cells_in(bbox) -> list:
+    """
+    Returns every grid node whose cell overlaps the box.
+    """
+    min_lat, max_lat, min_lon, max_lon = bbox
+    def nodes(low: float, high: float, step: float) -> list:
+        return [i * step for i in range(round(low / step), round(high / step) + 1)]
+    return [
+        (lat, lon)
+        for lat in nodes(min_lat, max_lat, POWER_LAT_STEP_DEG)
+        for lon in nodes(min_lon, max_lon, POWER_LON_STEP_DEG)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", required=True, help="SQLite store to create or extend")
+    parser.add_argument("--region", action="append", default=[], choices=sorted(REGIONS))
+    parser.add_argument("--bbox", action="append", default=[], nargs=4, type=float,
+                        metavar=("MIN_LAT", "MAX_LAT", "MIN_LON", "MAX_LON"))
+    parser.add_argument("--parameters", default=",".join(AGROCLIMATE_PARAMETERS))
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    boxes = [REGIONS[name] for name in args.region] + args.bbox
+    if not boxes:
+        parser.error("give at least one --region or --bbox")
+    parameters = tuple(args.parameters.split(","))
+
+    cache = ClimatologyCache(db_path=args.db)
+    cells = {cache_key(lat, lon, parameters): (lat, lon) for box in boxes for lat, lon in cells_in(box)}
+    pending = [cell for key, cell in cells.items() if key not in cache]
+    print(f"{len(cells)} cell(s) in region, {len(cells) - len(pending)} already stored, downloading {len(pending)}")
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(fetch_climatology_sync, lat, lon, parameters, cache): (lat, lon) for lat, lon in pending}
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                future.result()
+            except Exception as e:
+                failed += 1
+                print(f"❌ Cell {futures[future]} failed: {e}")
+            if done % 100 == 0:
+                print(f"... {done}/{len(pending)}")
+
+    print(f"✅ Stored {len(pending) - failed} cell(s); {failed} failed. Store: {args.db}")
+
+if __name__ == "__main__":
+    main()
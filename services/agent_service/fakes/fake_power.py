@@ -0,0 +1,59 @@
+"""
+Local stand-in for the NASA POWER climatology point API.
+
+Returns deterministic monthly values for any point and sleeps for a configurable latency
+before answering, so get_agroclimate_overview and the bulk download tool can run without
+network access. Run from the services/ directory:
+
+    FAKE_POWER_LATENCY_MS=300 uvicorn agent_service.fakes.fake_power:app --port 8102
+    NASA_POWER_URL=http://127.0.0.1:8102/api/temporal/climatology/point adk web
+"""
+import asyncio
+import hashlib
+import math
+import os
+
+from fastapi import FastAPI
+
+LATENCY_MS = float(os.getenv("FAKE_POWER_LATENCY_MS", "0"))
+MONTHS = ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"]
+
+# (annual mean, seasonal amplitude) per parameter, roughly Indian-plains magnitudes.
+PARAMETER_SHAPES = {
+    "T2M": (25.0, 6.0),
+    "PRECTOTCORR": (3.0, 3.0),
+    "RH2M": (60.0, 20.0),
+    "WS2M": (2.5, 1.0),
+    "ALLSKY_SFC_SW_DWN": (5.0, 1.2)
+}
+
+app = FastAPI(title="Fake NASA POWER API")
+
+# Counts served requests so tests can assert that the cache avoided a call.
+requests_served = 0
+
+def monthly_values(parameter: str, latitude: float, longitude: float) -> dict:
+    mean, amplitude = PARAMETER_SHAPES.get(parameter, (1.0, 0.5))
+    digest = hashlib.sha256(f"{parameter}:{latitude:.2f}:{longitude:.2f}".encode("utf-8")).digest()
+    offset = (int.from_bytes(digest[:4], "big") / 2**32 - 0.5) * amplitude
+    values = {
+        month: round(max(0.0, mean + offset + amplitude * math.sin(2 * math.pi * (i - 3) / 12)), 2)
+        for i, month in enumerate(MONTHS)
+    }
+    values["ANN"] = round(sum(values.values()) / len(MONTHS), 2)
+    return values
+
+@app.get("/api/temporal/climatology/point")
+async def climatology(parameters: str, latitude: float, longitude: float, community: str = "AG", format: str = "JSON"):
+    global requests_served
+    requests_served += 1
+    if LATENCY_MS:
+        await asyncio.sleep(LATENCY_MS / 1000)
+
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [longitude, latitude]},
+        "properties": {
+            "parameter": {name: monthly_values(name, latitude, longitude) for name in parameters.split(",")}
+        }
+    }
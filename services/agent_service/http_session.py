@@ -0,0 +1,152 @@
+import asyncio
+import importlib.util
+import logging
+import os
+import random
+import threading
+import weakref
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Set logging
+logger = logging.getLogger(__name__)
+
+# Configuration constants
+HTTP_POOL_CONNECTIONS = int(os.getenv("AGENT_HTTP_POOL_CONNECTIONS", "10"))  # distinct hosts kept warm
+HTTP_POOL_MAXSIZE = int(os.getenv("AGENT_HTTP_POOL_MAXSIZE", "20"))  # keep-alive connections per host
+HTTP_RETRIES = int(os.getenv("AGENT_HTTP_RETRIES", "3"))
+# Read retries repeat the whole request timeout, so keep them low; one covers a stale keep-alive connection.
+HTTP_READ_RETRIES = int(os.getenv("AGENT_HTTP_READ_RETRIES", "1"))
+HTTP_BACKOFF_SECONDS = float(os.getenv("AGENT_HTTP_BACKOFF_SECONDS", "0.2"))
+HTTP_BACKOFF_JITTER_SECONDS = float(os.getenv("AGENT_HTTP_BACKOFF_JITTER_SECONDS", "0.2"))
+HTTP_TIMEOUT_SECONDS = float(os.getenv("AGENT_HTTP_TIMEOUT_SECONDS", "30"))
+HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv("AGENT_HTTP_CONNECT_TIMEOUT_SECONDS", "5"))
+# HTTP/2 multiplexes concurrent tool calls over one connection when the h2 package is installed.
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+
+# Responses that mean "try again shortly" rather than "your request is wrong".
+RETRY_STATUSES = (429, 502, 503, 504)
+# Only idempotent methods are re-sent once a request may have reached the server. Other methods
+# are retried only when the connection was never established.
+RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+_session = None
+_session_lock = threading.Lock()
+# Event loop -> (async client, closer). httpx connections cannot be shared across loops.
+_async_clients = weakref.WeakKeyDictionary()
+
+def _retry_policy() -> Retry:
+    options = dict(
+        total=HTTP_RETRIES,
+        connect=HTTP_RETRIES,
+        read=HTTP_READ_RETRIES,
+        status=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF_SECONDS,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=RETRY_METHODS,
+        respect_retry_after_header=True,
+        # Hand the last response back to the caller so it can surface the service's error detail.
+        raise_on_status=False
+    )
+    try:
+        return Retry(backoff_jitter=HTTP_BACKOFF_JITTER_SECONDS, **options)
+    except TypeError:
+        # urllib3 < 2 has no jitter option; retries still back off exponentially.
+        return Retry(**options)
+
+def get_session() -> requests.Session:
+    """
+    Returns the process-wide pooled session used by agent tools.
+
+    Connections stay alive between tool calls, so repeated calls to the prediction service or
+    NASA POWER skip the TCP and TLS handshakes. Connection errors, read errors and 429/5xx
+    responses are retried with jittered exponential backoff.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                adapter = HTTPAdapter(
+                    pool_connections=HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=HTTP_POOL_MAXSIZE,
+                    max_retries=_retry_policy()
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+                logger.info(
+                    f"✅ Shared HTTP session created (pool {HTTP_POOL_MAXSIZE}/host, {HTTP_RETRIES} retries)."
+                )
+    return _session
+
+async def _close_with_loop(client: httpx.AsyncClient):
+    # Parked at the yield for the loop's lifetime. asyncio.run() (and uvicorn) finalize pending
+    # async generators before closing the loop, which runs the finally block and closes the
+    # client's connections on the loop that opened them.
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+async def get_async_client() -> httpx.AsyncClient:
+    """
+    Returns the pooled async client for the running event loop, creating it on first use.
+    The client is closed when the loop shuts down.
+
+    Async tools await it instead of blocking, so the ADK runner can execute several tool calls
+    of one turn concurrently. Cancelling the calling task (e.g. when a session is aborted)
+    cancels the in-flight request.
+    """
+    loop = asyncio.get_running_loop()
+    client, _ = _async_clients.get(loop, (None, None))
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=HTTP2_ENABLED,
+            timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS),
+            limits=httpx.Limits(max_connections=HTTP_POOL_MAXSIZE * HTTP_POOL_CONNECTIONS,
+                                max_keepalive_connections=HTTP_POOL_MAXSIZE)
+        )
+        closer = _close_with_loop(client)
+        await closer.__anext__()
+        _async_clients[loop] = (client, closer)
+        logger.info(f"✅ Shared async HTTP client created (HTTP/2 {'on' if HTTP2_ENABLED else 'off'}).")
+    return client
+
+def _backoff_delay(attempt: int) -> float:
+    return HTTP_BACKOFF_SECONDS * (2 ** attempt) + random.uniform(0, HTTP_BACKOFF_JITTER_SECONDS)
+
+async def request_with_retries(method: str, url: str, **kwargs) -> httpx.Response:
+    """
+    Sends a request on the shared async client with the same retry policy as the sync session:
+    connection failures and 429/502/503/504 responses are retried with jittered exponential
+    backoff, read timeouts at most HTTP_READ_RETRIES times. The last response is returned
+    as-is so callers can surface the service's error detail.
+    """
+    client = await get_async_client()
+    # Like urllib3, only connection failures are retried for methods outside RETRY_METHODS. A
+    # protocol error (e.g. a dropped keep-alive connection) may come after the request was sent.
+    retryable = method.upper() in RETRY_METHODS
+    attempt, read_attempts = 0, 0
+    while True:
+        try:
+            response = await client.request(method, url, **kwargs)
+        except (httpx.ConnectError, httpx.ConnectTimeout):
+            if attempt >= HTTP_RETRIES:
+                raise
+        except httpx.RemoteProtocolError:
+            if not retryable or attempt >= HTTP_RETRIES:
+                raise
+        except httpx.ReadTimeout:
+            if not retryable or attempt >= HTTP_RETRIES or read_attempts >= HTTP_READ_RETRIES:
+                raise
+            read_attempts += 1
+        else:
+            if not retryable or response.status_code not in RETRY_STATUSES or attempt >= HTTP_RETRIES:
+                return response
+            await response.aclose()
+        await asyncio.sleep(_backoff_delay(attempt))
+        attempt += 1
@@ -0,0 +1,212 @@
+"""
+Deterministic fast path for structured farmer requests.
+
+Most turns start the same way: the root agent spends a model call deciding to call
+agri_analyzer_agent, which is itself an LLM that spends two more calls wrapping one HTTP tool.
+When a message names a supported crop, a location and a known intent, the router skips those
+hops:
+
+- before_model_callback answers the root agent's first model call of the turn with a direct
+  get_crop_yield_prediction function call, so no routing call is made.
+- before_tool_callback answers agri_analyzer_agent calls the root agent makes on its own by
+  calling get_crop_yield_prediction directly.
+
+Either way the prediction is written to the "agrianalysis" session state, as agri_analyzer_agent's
+output_key would have. Every decision is logged with an estimate of the time saved, based on
+running averages of the hops it replaced.
+"""
+import json
+import logging
+import os
+import re
+import time
+from typing import Dict, NamedTuple, Optional
+
+from google.genai import types
+from google.adk.models import LlmResponse
+
+from .prompt import PUNGDE_AGENT_PROMPT
+from .query_normalizer import canonical_crop, ensure_crop_patterns, extract_location, normalize_text
+from .sub_agents.agri_analyzer_agent.agri_analyzer_agent import get_crop_yield_prediction
+
+# Set logging
+logger = logging.getLogger(__name__)
+
+# Configuration constants
+INTENT_ROUTER_ENABLED = os.getenv("INTENT_ROUTER_ENABLED", "true").lower() in ("1", "true", "yes")
+PREDICTION_TOOL = "get_crop_yield_prediction"
+ANALYZER_TOOL = "agri_analyzer_agent"
+ROUTING_CALL = "routing_call"
+# State key agri_analyzer_agent writes its answer to (its output_key).
+ANALYSIS_STATE_KEY = "agrianalysis"
+# In-flight timers older than this belong to calls that failed before their after-callback ran.
+STALE_TIMER_SECONDS = 600
+
+def _supported_crops(prompt: str) -> frozenset:
+    match = re.search(r"Supported Crops[^\n]*\n([^\n]+)", prompt)
+    return frozenset(crop.strip().lower() for crop in match.group(1).split(",")) if match else frozenset()
+
+SUPPORTED_CROPS = _supported_crops(PUNGDE_AGENT_PROMPT)
+
+# Phrases that mean the turn needs the crop's yield data first (every flow in the root prompt does).
+INTENT_PHRASES = {
+    "suitability": ["can i grow", "should i grow", "suitable", "will it grow", "grow well"],
+    "yield": ["yield", "how much", "production", "harvest", "tons per hectare", "predict"],
+    "techniques": ["grow anyway", "still grow", "techniques", "how to grow", "how can i grow"],
+    "seeds": ["seed", "seeds", "variety", "varieties"],
+}
+
+class RouteDecision(NamedTuple):
+    crop_name: str
+    location_name: str
+    intent: str
+
+def classify_intent(text: str) -> Optional[str]:
+    normalized = f" {normalize_text(text)} "
+    for intent, phrases in INTENT_PHRASES.items():
+        if any(f" {phrase} " in normalized for phrase in phrases):
+            return intent
+    return None
+
+def route(text: str) -> Optional[RouteDecision]:
+    """
+    Returns the direct-call decision for a farmer message, or None to leave it to the LLM.
+    Messages that name no place or several ("rice in Nashik or Pune") are left to the LLM.
+    """
+    crop = canonical_crop(text)
+    if crop is None or crop not in SUPPORTED_CROPS:
+        return None
+    location = extract_location(text)
+    if location is None:
+        return None
+    intent = classify_intent(text)
+    if intent is None:
+        return None
+    return RouteDecision(crop, location, intent)
+
+class HopLatency:
+    """
+    Exponential moving averages of the hops the router replaces.
+    """
+    def __init__(self, alpha: float = 0.2):
+        self.alpha = alpha
+        self.averages: Dict[str, float] = {}
+        self.routed = 0
+        self.passed = 0
+
+    def observe(self, hop: str, seconds: float):
+        previous = self.averages.get(hop)
+        self.averages[hop] = seconds if previous is None else previous + self.alpha * (seconds - previous)
+
+    def estimate(self, hop: str) -> float:
+        return self.averages.get(hop, 0.0)
+
+hop_latency = HopLatency()
+
+# In-flight timers: invocation id / tool call -> (hop, start).
+_model_calls: Dict[str, tuple] = {}
+_tool_calls: Dict[object, tuple] = {}
+
+def _start_timer(timers: dict, key, hop: str) -> None:
+    now = time.perf_counter()
+    # A call that raised never reaches its after-callback; drop its timer once it is stale.
+    for stale in [k for k, (_, start) in timers.items() if now - start > STALE_TIMER_SECONDS]:
+        del timers[stale]
+    timers[key] = (hop, now)
+
+def _stop_timer(timers: dict, key) -> None:
+    pending = timers.pop(key, None)
+    if pending is not None:
+        hop, start = pending
+        hop_latency.observe(hop, time.perf_counter() - start)
+
+def _store_analysis(tool_context, result) -> None:
+    # Mirror the state update agri_analyzer_agent's output_key would have made.
+    if isinstance(result, dict) and result.get("status") != "error":
+        tool_context.state[ANALYSIS_STATE_KEY] = json.dumps(result)
+
+def _latest_user_text(llm_request) -> Optional[str]:
+    """
+    Returns the farmer's message if the request starts a new turn (no tool results yet).
+    """
+    if not llm_request.contents:
+        return None
+    latest = llm_request.contents[-1]
+    if latest.role != "user" or not latest.parts:
+        return None
+    if any(part.function_response for part in latest.parts):
+        return None
+    text = " ".join(part.text for part in latest.parts if part.text)
+    return text or None
+
+async def before_model_callback(callback_context, llm_request) -> Optional[LlmResponse]:
+    """
+    Root-agent callback: replaces the routing model call with a direct prediction tool call.
+    """
+    text = _latest_user_text(llm_request) if INTENT_ROUTER_ENABLED else None
+    if not text:
+        return None
+    await ensure_crop_patterns()
+    decision = route(text)
+    if decision is None:
+        hop_latency.passed += 1
+        logger.info("🧭 Router: no fast path for this message; the LLM decides.")
+        # Only the turn's first call decides the route, so only it feeds the routing estimate.
+        _start_timer(_model_calls, callback_context.invocation_id, ROUTING_CALL)
+        return None
+
+    hop_latency.routed += 1
+    logger.info(
+        f"🧭 Router: {decision.intent} request for {decision.crop_name} in '{decision.location_name}' -> "
+        f"{PREDICTION_TOOL} directly, skipping the routing call (~{hop_latency.estimate(ROUTING_CALL):.2f}s) "
+        f"and {ANALYZER_TOOL} (~{hop_latency.estimate(ANALYZER_TOOL):.2f}s)"
+    )
+    return LlmResponse(content=types.Content(role="model", parts=[types.Part(
+        function_call=types.FunctionCall(
+            name=PREDICTION_TOOL,
+            args={"crop_name": decision.crop_name, "location_name": decision.location_name}
+        )
+    )]))
+
+def after_model_callback(callback_context, llm_response) -> Optional[LlmResponse]:
+    _stop_timer(_model_calls, callback_context.invocation_id)
+    return None
+
+def _call_id(tool_context):
+    return getattr(tool_context, "function_call_id", None) or id(tool_context)
+
+async def before_tool_callback(tool, args: dict, tool_context) -> Optional[dict]:
+    """
+    Root-agent callback: answers agri_analyzer_agent calls with a direct prediction call.
+    """
+    if tool.name == PREDICTION_TOOL:
+        _start_timer(_tool_calls, _call_id(tool_context), PREDICTION_TOOL)
+        return None
+    if tool.name != ANALYZER_TOOL:
+        return None
+
+    request = args.get("request", "") if isinstance(args.get("request"), str) else ""
+    if INTENT_ROUTER_ENABLED:
+        await ensure_crop_patterns()
+    crop = canonical_crop(request) if INTENT_ROUTER_ENABLED else None
+    location = extract_location(request) if crop in SUPPORTED_CROPS else None
+    if location is None:
+        _start_timer(_tool_calls, _call_id(tool_context), ANALYZER_TOOL)
+        return None
+
+    start = time.perf_counter()
+    result = await get_crop_yield_prediction(crop, location)
+    elapsed = time.perf_counter() - start
+    hop_latency.routed += 1
+    _store_analysis(tool_context, result)
+    logger.info(
+        f"🧭 Router: {ANALYZER_TOOL}({crop}, '{location}') answered by {PREDICTION_TOOL} in {elapsed:.2f}s, "
+        f"saving ~{max(0.0, hop_latency.estimate(ANALYZER_TOOL) - elapsed):.2f}s"
+    )
+    return result
+
+def after_tool_callback(tool, args: dict, tool_context, tool_response) -> Optional[dict]:
+    if tool.name == PREDICTION_TOOL:
+        _store_analysis(tool_context, tool_response)
+    _stop_timer(_tool_calls, _call_id(tool_context))
+    return None
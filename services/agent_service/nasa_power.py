@@ -0,0 +1,178 @@
+"""
+NASA POWER climatology client with a persistent per-cell cache.
+
+Long-term monthly climatology is fixed for a POWER grid cell, so responses are keyed by the
+nearest node of the MERRA-2 grid POWER serves (0.5° latitude x 0.625° longitude) and the
+requested parameter set, and never expire. The
+in-process tier is a dict of parsed parameter blocks (a hit is a lookup, no I/O); the
+optional SQLite tier (NASA_POWER_CACHE_DB) keeps them across restarts and can be
+pre-populated for whole regions with download_power_climatology.py.
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict, Optional, Sequence, Tuple
+
+from .http_session import get_session, request_with_retries
+
+# Set logging
+logger = logging.getLogger(__name__)
+
+# Configuration constants
+NASA_POWER_URL = os.getenv("NASA_POWER_URL", "https://power.larc.nasa.gov/api/temporal/climatology/point")
+NASA_POWER_TIMEOUT_SECONDS = float(os.getenv("NASA_POWER_TIMEOUT_SECONDS", "15"))
+NASA_POWER_CACHE_DB = os.getenv("NASA_POWER_CACHE_DB")
+NASA_POWER_CACHE_MAX_ENTRIES = int(os.getenv("NASA_POWER_CACHE_MAX_ENTRIES", "100000"))
+POWER_LAT_STEP_DEG = 0.5
+POWER_LON_STEP_DEG = 0.625
+
+AGROCLIMATE_PARAMETERS = ("T2M", "PRECTOTCORR", "RH2M", "WS2M", "ALLSKY_SFC_SW_DWN")
+
+# parameter -> {month (JAN..DEC, ANN) -> value}
+ParameterBlock = Dict[str, Dict[str, float]]
+
+def snap_to_cell(lat: float, lon: float) -> Tuple[float, float]:
+    """
+    Returns the POWER grid node nearest to the point; POWER answers every point in that
+    node's cell with the node's values.
+    """
+    def nearest(value: float, step: float) -> float:
+        return round(round(value / step) * step, 4)
+    return nearest(lat, POWER_LAT_STEP_DEG), nearest(lon, POWER_LON_STEP_DEG)
+
+def cache_key(lat: float, lon: float, parameters: Sequence[str]) -> str:
+    cell_lat, cell_lon = snap_to_cell(lat, lon)
+    return f"{cell_lat:.3f}:{cell_lon:.3f}:{','.join(sorted(parameters))}"
+
+def climatology_url(lat: float, lon: float, parameters: Sequence[str]) -> str:
+    # NASA POWER API - using climatology endpoint for monthly averages
+    # This endpoint provides long-term monthly climatology data
+    return (
+        f"{NASA_POWER_URL}?"
+        f"parameters={','.join(parameters)}"
+        f"&community=AG"
+        f"&latitude={lat}&longitude={lon}"
+        f"&format=JSON"
+    )
+
+class ClimatologyCache:
+    def __init__(self, max_entries: int = 100000, db_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: Dict[str, ParameterBlock] = {}
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS climatology (key TEXT PRIMARY KEY, parameters TEXT)")
+            self._db.commit()
+
+    def get_in_memory(self, key: str) -> Optional[ParameterBlock]:
+        """
+        Returns the entry if it is held in memory. Never blocks, so it is safe on the event loop.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+        return entry
+
+    def get(self, key: str) -> Optional[ParameterBlock]:
+        entry = self.get_in_memory(key)
+        if entry is not None:
+            return entry
+        with self._lock:
+            if self._db is not None:
+                row = self._db.execute("SELECT parameters FROM climatology WHERE key = ?", (key,)).fetchone()
+                if row:
+                    entry = json.loads(row[0])
+                    self._remember(key, entry)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return entry
+            self.misses += 1
+            return None
+
+    def put(self, key: str, parameters: ParameterBlock) -> None:
+        with self._lock:
+            self._remember(key, parameters)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO climatology (key, parameters) VALUES (?, ?)",
+                    (key, json.dumps(parameters, separators=(",", ":")))
+                )
+                self._db.commit()
+
+    def __contains__(self, key: str) -> bool:
+        if key in self._entries:
+            return True
+        with self._lock:
+            return self._db is not None and self._db.execute(
+                "SELECT 1 FROM climatology WHERE key = ?", (key,)
+            ).fetchone() is not None
+
+    def _remember(self, key: str, parameters: ParameterBlock) -> None:
+        # Entries never go stale; past the bound, the oldest insert is dropped (it stays on disk).
+        self._entries[key] = parameters
+        while len(self._entries) > self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "persistent": self._db is not None,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+climatology_cache = ClimatologyCache(max_entries=NASA_POWER_CACHE_MAX_ENTRIES, db_path=NASA_POWER_CACHE_DB)
+
+def _parameter_block(response: dict, parameters: Sequence[str]) -> ParameterBlock:
+    block = response["properties"]["parameter"]
+    return {name: block[name] for name in parameters}
+
+async def fetch_climatology(lat: float, lon: float, parameters: Sequence[str] = AGROCLIMATE_PARAMETERS) -> ParameterBlock:
+    """
+    Returns the monthly climatology of the point's grid cell, from the cache or from POWER.
+    """
+    key = cache_key(lat, lon, parameters)
+    cached = climatology_cache.get_in_memory(key)
+    if cached is not None:
+        return cached
+    # The SQLite tier blocks, so only it runs off the event loop.
+    cached = await asyncio.to_thread(climatology_cache.get, key)
+    if cached is not None:
+        return cached
+    cell_lat, cell_lon = snap_to_cell(lat, lon)
+    response = await request_with_retries(
+        "GET", climatology_url(cell_lat, cell_lon, parameters), timeout=NASA_POWER_TIMEOUT_SECONDS
+    )
+    response.raise_for_status()
+    block = _parameter_block(response.json(), parameters)
+    await asyncio.to_thread(climatology_cache.put, key, block)
+    return block
+
+def fetch_climatology_sync(lat: float, lon: float, parameters: Sequence[str] = AGROCLIMATE_PARAMETERS,
+                           cache: ClimatologyCache = None) -> ParameterBlock:
+    """
+    Blocking variant of fetch_climatology for the bulk download tool.
+    """
+    cache = cache or climatology_cache
+    key = cache_key(lat, lon, parameters)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    cell_lat, cell_lon = snap_to_cell(lat, lon)
+    response = get_session().get(climatology_url(cell_lat, cell_lon, parameters), timeout=NASA_POWER_TIMEOUT_SECONDS)
+    response.raise_for_status()
+    block = _parameter_block(response.json(), parameters)
+    cache.put(key, block)
+    return block
@@ -0,0 +1,237 @@
+"""
+Embedding-free normalizer for farmer questions and agent requests.
+
+Reduces free text to the parts that decide an agronomy answer: the canonical crop, the
+location (a rounded coordinate cell when coordinates are present, otherwise the normalized
+place name) and a coarse intent. Everything is regex and keyword based, so it runs
+deterministically.
+
+Crop aliases come from the prediction service, which owns the crop list: its
+assets/crop_aliases.json when the file is reachable (a checkout, or CROP_ALIASES_PATH),
+otherwise its GET /crops endpoint, fetched once on first use. Async callers await
+ensure_crop_patterns() first, so that load runs off the event loop.
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Set logging
+logger = logging.getLogger(__name__)
+
+# Configuration constants
+CROP_ALIASES_PATH = os.getenv("CROP_ALIASES_PATH", os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "prediction_service", "assets", "crop_aliases.json"
+))
+PREDICTION_CROPS_URL = os.getenv(
+    "PREDICTION_CROPS_URL",
+    os.getenv("PREDICTION_SERVICE_URL", "http://127.0.0.1:8001/predict").rsplit("/", 1)[0] + "/crops"
+)
+CROP_ALIASES_TIMEOUT_SECONDS = float(os.getenv("CROP_ALIASES_TIMEOUT_SECONDS", "5"))
+CROP_ALIASES_RETRY_SECONDS = float(os.getenv("CROP_ALIASES_RETRY_SECONDS", "60"))
+
+# Keyword -> intent per agent. A request matching several intents is treated as "overall".
+AGENT_INTENTS = {
+    "yield_improvement_agent": {
+        "varieties": ["variety", "varieties", "hybrid", "seed rate"],
+        "fertilizer": ["fertilizer", "fertiliser", "npk", "nutrient", "manure", "urea"],
+        "pests": ["pest", "disease", "insect", "fungal", "spray"],
+        "irrigation": ["irrigation", "watering", "drip", "sprinkler"],
+    },
+    "grow_anyways_agent": {
+        "protected_cultivation": ["polyhouse", "greenhouse", "shade net", "net house", "tunnel"],
+        "water": ["irrigation", "drip", "rainfall", "drought", "water"],
+        "soil": ["soil", "ph", "amendment", "lime", "gypsum", "compost"],
+        "temperature": ["temperature", "heat", "frost", "cold"],
+    },
+    "seed_identifier_agent": {
+        "suppliers": ["where to buy", "buy", "supplier", "dealer", "shop", "store"],
+        "price": ["price", "cost", "rate per kg", "budget"],
+        "certification": ["certified", "quality", "germination", "fake seed", "label"],
+    },
+}
+
+_PUNCTUATION = re.compile(r"[^\w\s]", re.UNICODE)
+_WHITESPACE = re.compile(r"\s+")
+_NUMBER = r"(-?\d{1,3}(?:\.\d+)?)"
+_LABELLED_COORDINATES = re.compile(
+    rf"lat(?:itude)?[\"']?\s*[:=]?\s*{_NUMBER}.{{0,40}}?lon(?:g|gitude)?[\"']?\s*[:=]?\s*{_NUMBER}",
+    re.IGNORECASE | re.DOTALL
+)
+_COORDINATE_PAIR = re.compile(rf"\(\s*{_NUMBER}\s*,\s*{_NUMBER}\s*\)")
+# The value ends at a newline, quote, sentence end or the next "label:" field.
+_LABELLED_LOCATION = re.compile(
+    r"location(?:[ _]name)?[\"']?\s*[:=]\s*[\"']?([^\n\"';.()]+?)(?=\s*(?:,\s*\w+\s*[:=]|[\n\"';.()]|$))",
+    re.IGNORECASE
+)
+# A capitalized phrase after a preposition. "for" is weak ("seeds for Kharif rice in Nashik"), so
+# its phrases only count when no other preposition names a place; "and"/"or" add alternatives.
+_PLACE_AFTER_PREPOSITION = re.compile(
+    r"\b(in|at|near|around|for|and|or)\s+([A-Z][\w.'-]*(?:(?:\s*,\s*|\s+)[A-Z][\w.'-]*)*)"
+)
+_WEAK_PREPOSITIONS = frozenset({"for"})
+_SENTENCE_END = re.compile(r"[.?!](?:\s|$)")
+# Capitalized words that are not (part of) a place: a place phrase ends before the first one.
+NON_PLACE_WORDS = frozenset({
+    # Seasons
+    "kharif", "rabi", "zaid", "zayad", "summer", "winter", "monsoon", "spring", "autumn", "season",
+    # Time
+    "during", "this", "next", "last", "year", "month", "today", "now",
+    "january", "february", "march", "april", "may", "june", "july", "august", "september",
+    "october", "november", "december",
+    # Other words that start a phrase or sentence
+    "i", "me", "my", "we", "our", "you", "your", "please", "what", "which", "how", "when", "where",
+    "why", "can", "should", "is", "are", "the", "best", "good", "organic", "certified", "hybrid",
+})
+
+def load_crop_aliases() -> Dict[str, List[str]]:
+    """
+    Returns {canonical crop: [aliases]} from the prediction service's alias list.
+    """
+    if os.path.exists(CROP_ALIASES_PATH):
+        with open(CROP_ALIASES_PATH) as f:
+            return json.load(f)
+    # Imported here so runs with the local file need no HTTP stack.
+    from .http_session import get_session
+
+    response = get_session().get(PREDICTION_CROPS_URL, timeout=CROP_ALIASES_TIMEOUT_SECONDS)
+    response.raise_for_status()
+    return response.json()["crops"]
+
+_crop_patterns: Optional[list] = None
+_next_load_attempt = 0.0
+_load_lock = threading.Lock()
+
+def crop_patterns() -> list:
+    """
+    Returns (alias pattern, canonical crop) pairs, loading the aliases on first use. A failed
+    load is retried after CROP_ALIASES_RETRY_SECONDS; until then no crop is recognized.
+    """
+    global _crop_patterns, _next_load_attempt
+    if _crop_patterns is not None:
+        return _crop_patterns
+    with _load_lock:
+        if _crop_patterns is None:
+            if time.monotonic() < _next_load_attempt:
+                return []
+            try:
+                aliases = load_crop_aliases()
+            except Exception as e:
+                _next_load_attempt = time.monotonic() + CROP_ALIASES_RETRY_SECONDS
+                logger.warning(f"⚠️ Could not load crop aliases from {PREDICTION_CROPS_URL}: {e}")
+                return []
+            names = [(alias, crop) for crop, crop_aliases in aliases.items() for alias in [crop] + crop_aliases]
+            # Longest first, so "kidney beans" wins over a shorter overlapping alias.
+            names.sort(key=lambda item: -len(item[0]))
+            _crop_patterns = [(re.compile(rf"\b{re.escape(alias)}\b", re.IGNORECASE), crop) for alias, crop in names]
+    return _crop_patterns
+
+async def ensure_crop_patterns() -> list:
+    """
+    crop_patterns() for the agent callbacks: a pending load (a file read or, when the agent is
+    deployed without the prediction service's assets, an HTTP fetch) runs in a worker thread.
+    """
+    if _crop_patterns is None and time.monotonic() >= _next_load_attempt:
+        return await asyncio.to_thread(crop_patterns)
+    return crop_patterns()
+
+def normalize_text(text: str) -> str:
+    """
+    Lowercases, strips punctuation and collapses whitespace.
+    """
+    return _WHITESPACE.sub(" ", _PUNCTUATION.sub(" ", text.lower())).strip()
+
+def canonical_crop(text: str) -> Optional[str]:
+    """
+    Returns the single supported crop the text talks about, or None if there is none or several.
+    """
+    found = {crop for pattern, crop in crop_patterns() if pattern.search(text)}
+    return found.pop() if len(found) == 1 else None
+
+def extract_coordinates(text: str) -> Optional[Tuple[float, float]]:
+    match = _LABELLED_COORDINATES.search(text) or _COORDINATE_PAIR.search(text)
+    if not match:
+        return None
+    lat, lon = float(match.group(1)), float(match.group(2))
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return None
+    return lat, lon
+
+def _place_prefix(phrase: str) -> Optional[str]:
+    """
+    Cuts a captured phrase at the sentence end and at the first word that is not part of a
+    place ("Pune During Summer" -> "Pune"). Returns None if nothing place-like is left.
+    """
+    phrase = _SENTENCE_END.split(phrase, 1)[0]
+    words = []
+    for word in phrase.split():
+        if word.strip(",").lower() in NON_PLACE_WORDS:
+            break
+        words.append(word)
+    place = " ".join(words).strip(" ,")
+    # "for Rice in Nashik": a capitalized crop name is not a place.
+    if not place or canonical_crop(place) is not None:
+        return None
+    return place
+
+def location_candidates(text: str) -> List[str]:
+    """
+    Returns the distinct place names the text mentions: the "location: ..." field if present,
+    otherwise capitalized phrases after "in", "at", "near", "around" (or "for", when none of
+    those names a place).
+    """
+    labelled = _LABELLED_LOCATION.search(text)
+    if labelled:
+        matches = [("in", labelled.group(1))]
+    else:
+        matches = [(match.group(1), match.group(2)) for match in _PLACE_AFTER_PREPOSITION.finditer(text)]
+
+    strong, weak = {}, {}
+    for preposition, phrase in matches:
+        place = _place_prefix(phrase.strip())
+        if place is not None:
+            found = weak if preposition in _WEAK_PREPOSITIONS else strong
+            found.setdefault(normalize_text(place), place)
+    return list((strong or weak).values())
+
+def extract_location(text: str) -> Optional[str]:
+    """
+    Returns the place the text is about, or None when it names no place or several.
+    """
+    candidates = location_candidates(text)
+    return candidates[0] if len(candidates) == 1 else None
+
+def location_cell(text: str, cell_deg: float = 0.5) -> Optional[str]:
+    """
+    Returns a location key: the centre of the grid cell holding the coordinates if present,
+    otherwise the normalized place name.
+    """
+    coordinates = extract_coordinates(text)
+    if coordinates:
+        lat, lon = ((value // cell_deg + 0.5) * cell_deg for value in coordinates)
+        return f"{lat:.2f},{lon:.2f}"
+    location = extract_location(text)
+    return normalize_text(location) if location else None
+
+def classify_intent(agent_name: str, text: str) -> str:
+    normalized = f" {normalize_text(text)} "
+    matched = {
+        intent
+        for intent, keywords in AGENT_INTENTS.get(agent_name, {}).items()
+        if any(f" {keyword} " in normalized for keyword in keywords)
+    }
+    return matched.pop() if len(matched) == 1 else "overall"
+
+def query_key(agent_name: str, text: str, cell_deg: float = 0.5) -> Optional[Tuple[str, str, str, str]]:
+    """
+    Returns (agent, crop, location cell, intent), or None when the crop or location is unclear.
+    """
+    crop = canonical_crop(text)
+    location = location_cell(text, cell_deg)
+    if crop is None or location is None:
+        return None
+    return agent_name, crop, location, classify_intent(agent_name, text)
@@ -0,0 +1,214 @@
+"""
+Response cache for the search-backed agronomy AgentTools.
+
+grow_anyways_agent, yield_improvement_agent and seed_identifier_agent answer questions that
+repeat heavily across farmers ("how to improve rice yield in Nashik"). Their answers are
+cached under (agent, canonical crop, location cell, intent) from query_normalizer, with a
+TTL per agent. The cache hooks into the root agent's tool callbacks: a hit skips the
+sub-agent run (a Gemini call plus google_search) entirely. Requests whose crop or location
+cannot be identified bypass the cache. SQLite lookups and writes run on a worker thread, and
+the cache's per-agent stats are logged every RESPONSE_CACHE_STATS_INTERVAL lookups.
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from .query_normalizer import ensure_crop_patterns, query_key
+
+# Set logging
+logger = logging.getLogger(__name__)
+
+# Configuration constants
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "5000"))
+RESPONSE_CACHE_DB = os.getenv("RESPONSE_CACHE_DB")
+RESPONSE_CACHE_CELL_DEG = float(os.getenv("RESPONSE_CACHE_CELL_DEG", "0.5"))
+RESPONSE_CACHE_STATS_INTERVAL = int(os.getenv("RESPONSE_CACHE_STATS_INTERVAL", "100"))
+# Misses whose sub-agent run never reached the after-callback (it raised) are forgotten after this.
+RESPONSE_CACHE_PENDING_SECONDS = float(os.getenv("RESPONSE_CACHE_PENDING_SECONDS", "600"))
+
+# Agent name -> TTL in seconds. Seed availability and prices move faster than agronomy advice.
+RESPONSE_CACHE_TTLS = {
+    "grow_anyways_agent": float(os.getenv("RESPONSE_CACHE_TTL_GROW_ANYWAYS", str(14 * 24 * 3600))),
+    "yield_improvement_agent": float(os.getenv("RESPONSE_CACHE_TTL_YIELD_IMPROVEMENT", str(14 * 24 * 3600))),
+    "seed_identifier_agent": float(os.getenv("RESPONSE_CACHE_TTL_SEED_IDENTIFIER", str(2 * 24 * 3600))),
+}
+
+CacheKey = Tuple[str, str, str, str]
+
+class ResponseCache:
+    def __init__(self, ttls: Dict[str, float], max_entries: int = 5000, db_path: Optional[str] = None):
+        self.ttls = ttls
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, object]]" = OrderedDict()
+        self._counters: Dict[str, Dict[str, float]] = {}
+        self.lookups = 0
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, agent TEXT, response TEXT, stored_at REAL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def _flat(key: CacheKey) -> str:
+        return "|".join(key)
+
+    def _count(self, agent: str, field: str, amount: float = 1):
+        if field in ("hits", "misses", "bypassed"):
+            self.lookups += 1
+        counters = self._counters.setdefault(
+            agent, {"hits": 0, "misses": 0, "bypassed": 0, "stored": 0, "miss_seconds": 0.0}
+        )
+        counters[field] += amount
+
+    def get(self, key: CacheKey):
+        agent, flat, now = key[0], self._flat(key), time.time()
+        ttl = self.ttls[agent]
+        with self._lock:
+            cached = self._entries.get(flat)
+            if cached and now - cached[0] < ttl:
+                self._entries.move_to_end(flat)
+                self._count(agent, "hits")
+                return cached[1]
+            if cached:
+                del self._entries[flat]
+
+            if self._db is not None:
+                row = self._db.execute("SELECT response, stored_at FROM responses WHERE key = ?", (flat,)).fetchone()
+                if row and now - row[1] < ttl:
+                    response = json.loads(row[0])
+                    self._remember(flat, row[1], response)
+                    self._count(agent, "hits")
+                    return response
+
+            self._count(agent, "misses")
+            return None
+
+    def put(self, key: CacheKey, response, miss_seconds: Optional[float] = None) -> None:
+        agent, flat, now = key[0], self._flat(key), time.time()
+        with self._lock:
+            self._remember(flat, now, response)
+            self._count(agent, "stored")
+            if miss_seconds is not None:
+                self._count(agent, "miss_seconds", miss_seconds)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, agent, response, stored_at) VALUES (?, ?, ?, ?)",
+                    (flat, agent, json.dumps(response), now)
+                )
+                self._db.execute(
+                    "DELETE FROM responses WHERE agent = ? AND stored_at < ?", (agent, now - self.ttls[agent])
+                )
+                self._db.commit()
+
+    def bypass(self, agent: str) -> None:
+        with self._lock:
+            self._count(agent, "bypassed")
+
+    def _remember(self, flat: str, stored_at: float, response) -> None:
+        self._entries[flat] = (stored_at, response)
+        self._entries.move_to_end(flat)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def hit_rate(self, agent: str) -> float:
+        counters = self._counters.get(agent)
+        lookups = counters["hits"] + counters["misses"] if counters else 0
+        return counters["hits"] / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        with self._lock:
+            agents = {}
+            for agent, counters in self._counters.items():
+                lookups = counters["hits"] + counters["misses"]
+                average_miss = counters["miss_seconds"] / counters["stored"] if counters["stored"] else 0.0
+                agents[agent] = {
+                    "hits": int(counters["hits"]),
+                    "misses": int(counters["misses"]),
+                    "bypassed": int(counters["bypassed"]),
+                    "hit_rate": round(counters["hits"] / lookups, 4) if lookups else 0.0,
+                    "average_miss_seconds": round(average_miss, 2),
+                    "estimated_seconds_saved": round(counters["hits"] * average_miss, 1)
+                }
+            return {
+                "entries": len(self._entries),
+                "persistent": self._db is not None,
+                "lookups": self.lookups,
+                "agents": agents
+            }
+
+response_cache = ResponseCache(RESPONSE_CACHE_TTLS, max_entries=RESPONSE_CACHE_MAX_ENTRIES, db_path=RESPONSE_CACHE_DB)
+
+# Tool call -> (cache key, start time) for sub-agent runs that missed the cache.
+_pending: Dict[object, Tuple[CacheKey, float]] = {}
+
+def _remember_pending(call_id, key: CacheKey, start: float) -> None:
+    # A sub-agent run that raised never reaches after_tool_callback; drop its entry once stale.
+    for stale in [k for k, (_, started) in _pending.items() if start - started > RESPONSE_CACHE_PENDING_SECONDS]:
+        del _pending[stale]
+    _pending[call_id] = (key, start)
+
+def _log_stats_periodically() -> None:
+    if RESPONSE_CACHE_STATS_INTERVAL and response_cache.lookups % RESPONSE_CACHE_STATS_INTERVAL == 0:
+        logger.info(f"📊 Response cache stats: {json.dumps(response_cache.stats())}")
+
+def _call_id(tool_context):
+    # ADK passes the same ToolContext to the before and after callbacks of one call.
+    return getattr(tool_context, "function_call_id", None) or id(tool_context)
+
+def _request_text(args: dict) -> str:
+    # AgentTool takes its input as a single "request" string.
+    return args.get("request") if isinstance(args.get("request"), str) else json.dumps(args, sort_keys=True)
+
+async def before_tool_callback(tool, args: dict, tool_context) -> Optional[dict]:
+    """
+    Root-agent callback: answers cached AgentTool calls without running the sub-agent.
+    """
+    if not RESPONSE_CACHE_ENABLED or tool.name not in RESPONSE_CACHE_TTLS:
+        return None
+    start = time.perf_counter()
+    await ensure_crop_patterns()
+    key = query_key(tool.name, _request_text(args), RESPONSE_CACHE_CELL_DEG)
+    if key is None:
+        response_cache.bypass(tool.name)
+        _log_stats_periodically()
+        return None
+
+    # The SQLite tier blocks, so lookups run off the event loop.
+    cached = await asyncio.to_thread(response_cache.get, key)
+    _log_stats_periodically()
+    if cached is None:
+        _remember_pending(_call_id(tool_context), key, start)
+        return None
+
+    # Mirror the state update the sub-agent's output_key would have made.
+    output_key = getattr(getattr(tool, "agent", None), "output_key", None)
+    if output_key and isinstance(cached, str):
+        tool_context.state[output_key] = cached
+    logger.info(
+        f"⚡ Response cache hit for {key} in {(time.perf_counter() - start) * 1000:.2f} ms "
+        f"(hit rate {response_cache.hit_rate(tool.name):.0%})"
+    )
+    return cached if isinstance(cached, dict) else {"result": cached}
+
+async def after_tool_callback(tool, args: dict, tool_context, tool_response) -> Optional[dict]:
+    """
+    Root-agent callback: stores successful AgentTool answers that missed the cache.
+    """
+    pending = _pending.pop(_call_id(tool_context), None)
+    if pending is None:
+        return None
+    key, start = pending
+    failed = isinstance(tool_response, dict) and tool_response.get("status") == "error"
+    if tool_response and not failed:
+        await asyncio.to_thread(response_cache.put, key, tool_response, time.perf_counter() - start)
+    return None
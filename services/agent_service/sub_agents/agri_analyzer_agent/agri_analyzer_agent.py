@@ -2,7 +2,8 @@ import logging
 
 from google.adk.agents import LlmAgent
 from . import prompt
-import requests
+from ...http_session import request_with_retries
+import httpx
 
 import os
 # Set logging
@@ -12,7 +13,20 @@ logger = logging.getLogger(__name__)
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
 DESCRIPTION = "Agricultural analysis tool that retrieves crop yield predictions, location coordinates, and crop requirements for a given crop and location"
 
-def get_crop_yield_prediction(crop_name: str, location_name: str) -> dict:
+PREDICTION_SERVICE_URL = os.getenv("PREDICTION_SERVICE_URL", "http://127.0.0.1:8001/predict")
+PREDICTION_TIMEOUT_SECONDS = float(os.getenv("PREDICTION_TIMEOUT_SECONDS", "30"))
+
+def _prediction_result(resp) -> dict:
+    """
+    Turns a prediction service response into the tool's return value.
+    """
+    if resp.status_code == 200:
+        # The response now includes crop_requirements automatically
+        return resp.json()
+    error_detail = resp.json().get("detail", "Unknown error") if resp.content else "Service unavailable"
+    return {"status": "error", "error_message": f"Prediction service error: {error_detail}"}
+
+async def get_crop_yield_prediction(crop_name: str, location_name: str) -> dict:
     """
     Calls the prediction service and returns yield prediction along with crop requirements.
     
@@ -20,19 +34,16 @@ def get_crop_yield_prediction(crop_name: str, location_name: str) -> dict:
         dict with keys: status, predicted_yield_tons_per_hectare, location_details, 
         crop_name, crop_requirements (N, P, K, temperature, humidity, ph, rainfall), notes
     """
-    url = os.getenv("PREDICTION_SERVICE_URL", "http://127.0.0.1:8001/predict")
     try:
-        resp = requests.post(url, json={"crop_name": crop_name, "location_name": location_name}, timeout=30)
-        if resp.status_code == 200:
-            data = resp.json()
-            # The response now includes crop_requirements automatically
-            return data
-        else:
-            error_detail = resp.json().get("detail", "Unknown error") if resp.content else "Service unavailable"
-            return {"status": "error", "error_message": f"Prediction service error: {error_detail}"}
-    except requests.exceptions.ConnectionError:
+        resp = await request_with_retries(
+            "POST", PREDICTION_SERVICE_URL,
+            json={"crop_name": crop_name, "location_name": location_name},
+            timeout=PREDICTION_TIMEOUT_SECONDS
+        )
+        return _prediction_result(resp)
+    except httpx.ConnectError:
         return {"status": "error", "error_message": "Could not connect to prediction service on port 8001."}
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         return {"status": "error", "error_message": "Prediction request timed out."}
     except Exception as e:
         return {"status": "error", "error_message": str(e)}
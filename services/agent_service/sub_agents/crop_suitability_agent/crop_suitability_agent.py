@@ -1,10 +1,10 @@
 import logging
 import os
 
-import requests
 from datetime import datetime, timedelta
 from google.adk.agents import LlmAgent
 from . import prompt
+from ...nasa_power import fetch_climatology
 
 # Set logging
 logger = logging.getLogger(__name__)
@@ -13,7 +13,33 @@ logger = logging.getLogger(__name__)
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
 DESCRIPTION = "Crop suitability expert that analyzes and explains whether a crop can grow successfully in a specific location based on climate data (temperature, rainfall, humidity)"
 
-def get_agroclimate_overview(lat: float, lon: float) -> dict:
+def _agroclimate_result(lat: float, lon: float, params: dict) -> dict:
+    agro_data = {
+        "temperature_C": params["T2M"],
+        "rainfall_mm": params["PRECTOTCORR"],
+        "humidity_percent": params["RH2M"],
+        "wind_speed_mps": params["WS2M"],
+        "solar_radiation_kWh_m2_day": params["ALLSKY_SFC_SW_DWN"],
+    }
+
+    return {
+        "status": "success",
+        "location_details": {
+            "latitude": lat,
+            "longitude": lon
+        },
+        "agro_climate": agro_data,
+        "notes": "Values represent long-term monthly climatology averages for this location."
+    }
+
+def _agroclimate_failure(e: Exception) -> dict:
+    return {
+        "status": "failed",
+        "error": str(e),
+        "notes": "Check latitude, longitude, or network connectivity."
+    }
+
+async def get_agroclimate_overview(lat: float, lon: float) -> dict:
     """
     Retrieves agro-climatic conditions for the past 12 months for the given location.
 
@@ -42,44 +68,9 @@ def get_agroclimate_overview(lat: float, lon: float) -> dict:
     """
 
     try:
-        # NASA POWER API - using climatology endpoint for monthly averages
-        # This endpoint provides long-term monthly climatology data
-        url = (
-            f"https://power.larc.nasa.gov/api/temporal/climatology/point?"
-            f"parameters=T2M,PRECTOTCORR,RH2M,WS2M,ALLSKY_SFC_SW_DWN"
-            f"&community=AG"
-            f"&latitude={lat}&longitude={lon}"
-            f"&format=JSON"
-        )
-
-        response = requests.get(url).json()
-
-        params = response["properties"]["parameter"]
-
-        agro_data = {
-            "temperature_C": params["T2M"],
-            "rainfall_mm": params["PRECTOTCORR"],
-            "humidity_percent": params["RH2M"],
-            "wind_speed_mps": params["WS2M"],
-            "solar_radiation_kWh_m2_day": params["ALLSKY_SFC_SW_DWN"],
-        }
-
-        return {
-            "status": "success",
-            "location_details": {
-                "latitude": lat,
-                "longitude": lon
-            },
-            "agro_climate": agro_data,
-            "notes": "Values represent long-term monthly climatology averages for this location."
-        }
-
+        return _agroclimate_result(lat, lon, await fetch_climatology(lat, lon))
     except Exception as e:
-        return {
-            "status": "failed",
-            "error": str(e),
-            "notes": "Check latitude, longitude, or network connectivity."
-        }
+        return _agroclimate_failure(e)
 
 # --- Screenplay Agent ---
 crop_suitability_agent = None
@@ -0,0 +1,152 @@
+"""
+Content-addressed cache for generated images.
+
+An image is identified by a SHA-256 digest of (model, normalized prompt, aspect ratio), so the
+same request maps to the same object name (and URL) in every process. Lookups check an in-process index
+first and then the object store; only a miss in both triggers a new Imagen call.
+
+Stores:
+- GcsImageStore: public objects in a Cloud Storage bucket (production)
+- LocalImageStore: files under a directory, served from IMAGE_STORE_BASE_URL (local runs)
+- MemoryImageStore: a dict, for tests
+"""
+import hashlib
+import os
+import re
+import threading
+from typing import Dict, Optional
+
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Casefolds and collapses whitespace, so formatting-only differences share an image.
+    """
+    return _WHITESPACE.sub(" ", prompt.casefold()).strip()
+
+def image_key(model: str, prompt: str, aspect_ratio: str) -> str:
+    payload = "\n".join((model, normalize_prompt(prompt), aspect_ratio))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class GcsImageStore:
+    def __init__(self, bucket_name: str, prefix: str = "generated_images/"):
+        # Imported here so local and test runs do not need the Cloud Storage SDK.
+        from google.cloud import storage
+
+        self.prefix = prefix
+        self._bucket = storage.Client().bucket(bucket_name)
+
+    def url_for(self, key: str) -> str:
+        return self._bucket.blob(f"{self.prefix}{key}.png").public_url
+
+    def url(self, key: str) -> Optional[str]:
+        blob = self._bucket.blob(f"{self.prefix}{key}.png")
+        return blob.public_url if blob.exists() else None
+
+    def put(self, key: str, image_bytes: bytes) -> str:
+        blob = self._bucket.blob(f"{self.prefix}{key}.png")
+        blob.upload_from_string(image_bytes, content_type="image/png")
+        blob.make_public()
+        return blob.public_url
+
+class LocalImageStore:
+    def __init__(self, root: str, base_url: Optional[str] = None):
+        self.root = root
+        self.base_url = base_url.rstrip("/") if base_url else None
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.png")
+
+    def url_for(self, key: str) -> str:
+        if self.base_url:
+            return f"{self.base_url}/{key}.png"
+        return "file://" + os.path.abspath(self._path(key))
+
+    def url(self, key: str) -> Optional[str]:
+        return self.url_for(key) if os.path.exists(self._path(key)) else None
+
+    def put(self, key: str, image_bytes: bytes) -> str:
+        # Write then rename, so a concurrent reader never sees a partial file.
+        tmp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(image_bytes)
+        os.replace(tmp_path, self._path(key))
+        return self.url_for(key)
+
+class MemoryImageStore:
+    def __init__(self, base_url: str = "memory://images"):
+        self.base_url = base_url
+        self.objects: Dict[str, bytes] = {}
+        self.puts = 0
+
+    def url_for(self, key: str) -> str:
+        return f"{self.base_url}/{key}.png"
+
+    def url(self, key: str) -> Optional[str]:
+        return self.url_for(key) if key in self.objects else None
+
+    def put(self, key: str, image_bytes: bytes) -> str:
+        self.objects[key] = image_bytes
+        self.puts += 1
+        return self.url_for(key)
+
+class ImageCache:
+    def __init__(self, store):
+        self.store = store
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self._index: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def url_for(self, key: str) -> str:
+        """
+        Returns the URL the image will have once stored, without checking that it exists.
+        """
+        return self.store.url_for(key)
+
+    def get(self, key: str) -> Optional[str]:
+        url = self._index.get(key)
+        if url is not None:
+            with self._lock:
+                self.hits += 1
+            return url
+        url = self.store.url(key)
+        with self._lock:
+            if url is None:
+                self.misses += 1
+                return None
+            self._index[key] = url
+            self.hits += 1
+            self.store_hits += 1
+        return url
+
+    def put(self, key: str, image_bytes: bytes) -> str:
+        url = self.store.put(key, image_bytes)
+        with self._lock:
+            self._index[key] = url
+        return url
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "store": type(self.store).__name__,
+            "indexed": len(self._index),
+            "hits": self.hits,
+            "store_hits": self.store_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+def create_store(backend: str, bucket_name: str):
+    """
+    Builds the image store for IMAGE_STORE_BACKEND ("gcs", "local" or "memory").
+    """
+    if backend == "gcs":
+        return GcsImageStore(bucket_name)
+    if backend == "local":
+        return LocalImageStore(os.getenv("IMAGE_STORE_DIR", "generated_images"), os.getenv("IMAGE_STORE_BASE_URL"))
+    if backend == "memory":
+        return MemoryImageStore()
+    raise ValueError(f"Unknown IMAGE_STORE_BACKEND '{backend}'; expected gcs, local or memory")
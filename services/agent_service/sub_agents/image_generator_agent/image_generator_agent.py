@@ -1,19 +1,31 @@
+import asyncio
 import os
 import logging
+import threading
 from google.adk.agents import LlmAgent
 from google.adk.tools.agent_tool import AgentTool
 
 from vertexai import init
 from vertexai.preview.vision_models import ImageGenerationModel
-from google.cloud import storage
 
 from . import prompt
+from .image_cache import ImageCache, create_store, image_key
+from .image_jobs import FAILED, ImageJobQueue
 
 logger = logging.getLogger(__name__)
 
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
 GCP_PROJECT = os.getenv("GOOGLE_CLOUD_PROJECT", "pungde-477205")
 GOOGLE_CLOUD_BUCKET = os.getenv("GOOGLE_CLOUD_BUCKET", "pungde-images")
+IMAGE_GENERATION_TIMEOUT_SECONDS = float(os.getenv("IMAGE_GENERATION_TIMEOUT_SECONDS", "120"))
+IMAGE_MODEL = os.getenv("IMAGE_MODEL", "imagen-4.0-generate-001")
+IMAGE_ASPECT_RATIO = "1:1"
+IMAGE_STORE_BACKEND = os.getenv("IMAGE_STORE_BACKEND", "gcs")
+# "blocking" waits for the image inside the tool call; "jobs" returns a job id at once and the URL
+# once get_image_status reports the job ready. Only enable it for clients that poll.
+IMAGE_GENERATION_MODE = os.getenv("IMAGE_GENERATION_MODE", "blocking")
+IMAGE_JOB_WORKERS = int(os.getenv("IMAGE_JOB_WORKERS", "2"))
+IMAGE_JOB_MAX_PENDING = int(os.getenv("IMAGE_JOB_MAX_PENDING", "16"))
 
 # Initialize Vertex
 if GCP_PROJECT:
@@ -21,31 +33,65 @@ if GCP_PROJECT:
 else:
     logger.warning("⚠️ No GCP_PROJECT set. Image generation will fail.")
 
+# Created on first use and reused by every call in this process.
+_image_model = None
+_image_model_lock = threading.Lock()
+_image_cache = None
+_image_cache_lock = threading.Lock()
+_image_jobs = None
+_image_jobs_lock = threading.Lock()
 
-def generate_image(prompt: str) -> dict:
+def get_image_model() -> ImageGenerationModel:
+    global _image_model
+    if _image_model is None:
+        with _image_model_lock:
+            if _image_model is None:
+                _image_model = ImageGenerationModel.from_pretrained(IMAGE_MODEL)
+    return _image_model
+
+def get_image_cache() -> ImageCache:
+    global _image_cache
+    if _image_cache is None:
+        with _image_cache_lock:
+            if _image_cache is None:
+                _image_cache = ImageCache(create_store(IMAGE_STORE_BACKEND, GOOGLE_CLOUD_BUCKET))
+                logger.info(f"✅ Image cache using '{IMAGE_STORE_BACKEND}' store.")
+    return _image_cache
+
+def get_image_jobs() -> ImageJobQueue:
+    global _image_jobs
+    if _image_jobs is None:
+        with _image_jobs_lock:
+            if _image_jobs is None:
+                _image_jobs = ImageJobQueue(workers=IMAGE_JOB_WORKERS, max_pending=IMAGE_JOB_MAX_PENDING)
+    return _image_jobs
+
+def _render_image(key: str, prompt: str) -> str:
     """
-    Generates an image and returns a public URL.
+    Generates the image with Imagen and stores it under its content key; returns the public URL.
+    """
+    result = get_image_model().generate_images(prompt=prompt, number_of_images=1, aspect_ratio=IMAGE_ASPECT_RATIO)
+    return get_image_cache().put(key, result[0]._image_bytes)
+
+
+def generate_image_sync(prompt: str) -> dict:
+    """
+    Generates an image and returns a public URL. Blocks until the image is uploaded.
     Returns: {
         "status": "success",
         "image_url": "<public accessible URL>",
     }
     """
     try:
-        # 1. Generate the image
-        model = ImageGenerationModel.from_pretrained("imagen-4.0-generate-001")
-        result = model.generate_images(prompt=prompt, number_of_images=1, aspect_ratio="1:1")
-        image_bytes = result[0]._image_bytes
-
-        # 2. Store in GCS
-        filename = f"generated_images/{hash(prompt)}.png"
-        storage_client = storage.Client()
-        bucket = storage_client.bucket(GOOGLE_CLOUD_BUCKET)
-        blob = bucket.blob(filename)
-        blob.upload_from_string(image_bytes, content_type="image/png")
-
-        # 3. Make the image public
-        blob.make_public()
-        image_url = blob.public_url
+        # 1. Reuse an identical earlier image if one exists
+        key = image_key(IMAGE_MODEL, prompt, IMAGE_ASPECT_RATIO)
+        cache = get_image_cache()
+        image_url = cache.get(key)
+        if image_url:
+            return {"status": "success", "image_url": image_url}
+
+        # 2. Generate the image, store it under its content key and make it public
+        image_url = _render_image(key, prompt)
 
         return {"status": "success", "image_url": image_url}
 
@@ -54,6 +100,81 @@ def generate_image(prompt: str) -> dict:
         return {"status": "error", "error_message": str(e)}
 
 
+def queue_image(prompt: str) -> dict:
+    """
+    Starts a background generation job and returns its id and state; image_url is included only
+    once the image is ready.
+    """
+    try:
+        key = image_key(IMAGE_MODEL, prompt, IMAGE_ASPECT_RATIO)
+        jobs = get_image_jobs()
+        job = jobs.get(key)
+        if job is None or job.state == FAILED:
+            cache = get_image_cache()
+            image_url = cache.get(key)
+            if image_url:
+                job = jobs.mark_ready(key, image_url)
+            else:
+                job = jobs.submit(key, cache.url_for(key), lambda: _render_image(key, prompt))
+                if job is None:
+                    logger.warning(f"⚠️ Image job queue full ({IMAGE_JOB_MAX_PENDING} pending); rejecting request.")
+                    return {"status": "error", "error_message": "Too many images are being generated right now. Try again shortly."}
+        return {"status": "success" if job.state != FAILED else "error", **job.as_dict()}
+
+    except Exception as e:
+        logger.error(f"❌ Image job submission failed: {e}", exc_info=True)
+        return {"status": "error", "error_message": str(e)}
+
+
+def get_image_status(job_id: str) -> dict:
+    """
+    Reports whether a queued image is ready.
+    Returns: {
+        "status": "success" or "error",
+        "job_id": "<job id>",
+        "state": "queued", "running", "ready" or "failed",
+        "image_url": "<public accessible URL>" (only when "ready"),
+    }
+    """
+    try:
+        job = get_image_jobs().get(job_id)
+        if job is not None:
+            return {"status": "success" if job.state != FAILED else "error", **job.as_dict()}
+        # Job ids are content keys, so an image made by another instance can still be found.
+        image_url = get_image_cache().get(job_id)
+        if image_url:
+            return {"status": "success", "job_id": job_id, "state": "ready", "image_url": image_url}
+        return {"status": "error", "job_id": job_id, "error_message": "Unknown image job."}
+
+    except Exception as e:
+        logger.error(f"❌ Image status lookup failed: {e}", exc_info=True)
+        return {"status": "error", "job_id": job_id, "error_message": str(e)}
+
+
+async def generate_image(prompt: str) -> dict:
+    """
+    Generates an image and returns a public URL.
+    Returns: {
+        "status": "success",
+        "image_url": "<public accessible URL>",
+    }
+    In job mode it returns immediately with "job_id" and "state" ("queued", "running" or
+    "ready"); image_url is only present once the state is "ready".
+    """
+    if IMAGE_GENERATION_MODE == "jobs":
+        # Only the cache check runs here; generation continues on the job pool after the turn.
+        return await asyncio.to_thread(queue_image, prompt)
+
+    # The Vertex AI and Cloud Storage SDKs are blocking, so the work runs on a worker thread
+    # while the event loop serves other tool calls. On cancellation or timeout the caller stops
+    # waiting immediately; the thread finishes its current SDK call in the background.
+    try:
+        return await asyncio.wait_for(asyncio.to_thread(generate_image_sync, prompt), IMAGE_GENERATION_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        logger.error(f"❌ Image generation timed out after {IMAGE_GENERATION_TIMEOUT_SECONDS}s")
+        return {"status": "error", "error_message": "Image generation timed out."}
+
+
 # TOOL-Agent wrapper
 image_generator_agent = None
 try:
@@ -62,7 +183,7 @@ try:
         name="image_generator_agent",
         description="Generates images based on prompts and returns image URL",
         instruction=prompt.IMAGE_GENERATOR_PROMPT,
-        tools=[generate_image],
+        tools=[generate_image, get_image_status] if IMAGE_GENERATION_MODE == "jobs" else [generate_image],
         output_key="image_url"
     )
 
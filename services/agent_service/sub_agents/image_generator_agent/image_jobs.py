@@ -0,0 +1,108 @@
+"""
+Background image generation jobs.
+
+A job is identified by the image's content key, so its final URL is known before the image
+exists and duplicate requests for the same image share one job. Jobs run on a fixed-size
+thread pool; at most `max_pending` can be queued or running, and submissions beyond that are
+rejected so callers can back off instead of piling up Imagen calls.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+QUEUED, RUNNING, READY, FAILED = "queued", "running", "ready", "failed"
+
+class ImageJob:
+    def __init__(self, job_id: str, image_url: str, state: str = QUEUED):
+        self.job_id = job_id
+        self.image_url = image_url
+        self.state = state
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+
+    def as_dict(self) -> dict:
+        result = {"job_id": self.job_id, "state": self.state}
+        # The URL 404s until the upload finishes, so it is only handed out once the image exists.
+        if self.state == READY:
+            result["image_url"] = self.image_url
+        if self.error:
+            result["error_message"] = self.error
+        if self.finished_at:
+            result["seconds"] = round(self.finished_at - self.created_at, 2)
+        return result
+
+class ImageJobQueue:
+    def __init__(self, workers: int = 2, max_pending: int = 16, max_finished: int = 1000):
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-job")
+        self._jobs: "OrderedDict[str, ImageJob]" = OrderedDict()
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def submit(self, job_id: str, image_url: str, work: Callable[[], str]) -> Optional[ImageJob]:
+        """
+        Queues `work` (which generates and stores the image and returns its URL) unless the same
+        job is already known. Returns None when the queue is full.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.state != FAILED:
+                return job
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                return None
+            job = ImageJob(job_id, image_url)
+            self._jobs[job_id] = job
+            self._jobs.move_to_end(job_id)
+            self._pending += 1
+        self._executor.submit(self._run, job, work)
+        return job
+
+    def mark_ready(self, job_id: str, image_url: str) -> ImageJob:
+        """
+        Records an image that already exists, so status lookups by job id succeed.
+        """
+        with self._lock:
+            job = ImageJob(job_id, image_url, READY)
+            job.finished_at = job.created_at
+            self._jobs[job_id] = job
+            self._trim()
+        return job
+
+    def get(self, job_id: str) -> Optional[ImageJob]:
+        return self._jobs.get(job_id)
+
+    def _run(self, job: ImageJob, work: Callable[[], str]):
+        job.state = RUNNING
+        try:
+            job.image_url = work()
+            job.state = READY
+        except Exception as e:
+            job.error = str(e)
+            job.state = FAILED
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self._pending -= 1
+                self._trim()
+
+    def _trim(self):
+        # Forget the oldest finished jobs; queued and running ones are always kept.
+        finished = [job_id for job_id, job in self._jobs.items() if job.state in (READY, FAILED)]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    def stats(self) -> dict:
+        with self._lock:
+            states = {}
+            for job in self._jobs.values():
+                states[job.state] = states.get(job.state, 0) + 1
+            return {"pending": self._pending, "max_pending": self.max_pending, "rejected": self.rejected, "jobs": states}
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the service as the agent_service package, the way ADK loads it from services/.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
@@ -0,0 +1,41 @@
+import importlib.util
+import os
+
+# Loaded from its file: the image_generator_agent package __init__ builds the agent, which needs
+# the Vertex AI SDK, while the cache itself has no dependencies.
+_spec = importlib.util.spec_from_file_location("image_cache", os.path.join(
+    os.path.dirname(__file__), "..", "sub_agents", "image_generator_agent", "image_cache.py"
+))
+image_cache = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(image_cache)
+
+MODEL = "imagen-4.0-generate-001"
+
+def test_key_is_stable_across_formatting_only_differences():
+    key = image_cache.image_key(MODEL, "Mature rice plant in an Indian farm field", "1:1")
+    assert key == image_cache.image_key(MODEL, "  mature RICE plant in an\nIndian farm field ", "1:1")
+    assert len(key) == 64
+    assert key != image_cache.image_key(MODEL, "Mature rice plant in an Indian farm field", "16:9")
+    assert key != image_cache.image_key("imagen-3.0-generate-002", "Mature rice plant in an Indian farm field", "1:1")
+
+def test_same_prompt_is_stored_once():
+    store = image_cache.MemoryImageStore()
+    cache = image_cache.ImageCache(store)
+    key = image_cache.image_key(MODEL, "Drip irrigation for banana", "1:1")
+
+    assert cache.get(key) is None
+    url = cache.put(key, b"png bytes")
+    assert url == cache.url_for(key)
+    assert cache.get(key) == url
+    assert store.puts == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+def test_another_process_reuses_the_stored_image(tmp_path):
+    key = image_cache.image_key(MODEL, "Polyhouse for tomatoes", "1:1")
+    image_cache.ImageCache(image_cache.LocalImageStore(str(tmp_path), "https://images.example")).put(key, b"png bytes")
+
+    # A fresh cache has an empty index, so the hit comes from the object store.
+    fresh = image_cache.ImageCache(image_cache.LocalImageStore(str(tmp_path), "https://images.example"))
+    assert fresh.get(key) == f"https://images.example/{key}.png"
+    assert fresh.stats()["store_hits"] == 1
+    assert sorted(os.listdir(tmp_path)) == [f"{key}.png"]
@@ -0,0 +1,16 @@
+import pytest
+
+from agent_service.intent_router import RouteDecision, route
+
+def test_route_calls_the_tool_for_one_crop_place_and_intent():
+    assert route("Best rice variety for Kharif in Nashik") == RouteDecision("rice", "Nashik", "seeds")
+    assert route("Can I grow maize in Pune During Summer?") == RouteDecision("maize", "Pune", "suitability")
+
+@pytest.mark.parametrize("text", [
+    "Best rice variety for Kharif",
+    "Rice yield for Rabi season",
+    "Can I grow rice in Nashik or in Pune?",
+    "Compare rice yield in Nashik and Guwahati",
+])
+def test_route_leaves_seasons_and_several_places_to_the_model(text):
+    assert route(text) is None
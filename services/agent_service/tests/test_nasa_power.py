@@ -0,0 +1,62 @@
+import asyncio
+
+import httpx
+import pytest
+
+from agent_service import nasa_power
+from agent_service.download_power_climatology import cells_in
+from agent_service.fakes import fake_power
+
+@pytest.mark.parametrize("point, node", [
+    ((19.99, 73.78), (20.0, 73.75)),
+    ((20.24, 74.2), (20.0, 74.375)),
+    ((20.26, 74.0), (20.5, 73.75)),
+    ((-33.87, 151.21), (-34.0, 151.25)),
+])
+def test_snap_to_cell_returns_nearest_grid_node(point, node):
+    assert nasa_power.snap_to_cell(*point) == node
+
+def test_points_in_one_cell_share_a_cache_key():
+    parameters = ("T2M", "RH2M")
+    assert nasa_power.cache_key(19.9, 73.7, parameters) == nasa_power.cache_key(20.1, 73.9, ("RH2M", "T2M"))
+    assert nasa_power.cache_key(19.9, 73.7, parameters) != nasa_power.cache_key(19.9, 74.1, parameters)
+
+def test_cells_in_covers_every_node_of_the_box_once():
+    cells = cells_in((19.6, 20.6, 73.4, 74.4))
+    assert len(cells) == len(set(cells))
+    assert {lat for lat, _ in cells} == {19.5, 20.0, 20.5}
+    assert {lon for _, lon in cells} == {73.125, 73.75, 74.375}
+
+def test_fetch_climatology_calls_power_once_per_cell(monkeypatch):
+    async def fake_request(method, url, **kwargs):
+        transport = httpx.ASGITransport(app=fake_power.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://power") as client:
+            return await client.request(method, url.replace(nasa_power.NASA_POWER_URL, "/api/temporal/climatology/point"))
+
+    monkeypatch.setattr(nasa_power, "request_with_retries", fake_request)
+    monkeypatch.setattr(nasa_power, "climatology_cache", nasa_power.ClimatologyCache())
+    monkeypatch.setattr(fake_power, "requests_served", 0)
+
+    async def fetch_all():
+        first = await nasa_power.fetch_climatology(20.01, 73.76)
+        second = await nasa_power.fetch_climatology(19.9, 73.8)
+        await nasa_power.fetch_climatology(21.0, 73.76)
+        return first, second
+
+    first, second = asyncio.run(fetch_all())
+    assert first == second
+    assert set(first) == set(nasa_power.AGROCLIMATE_PARAMETERS)
+    assert fake_power.requests_served == 2
+    assert nasa_power.climatology_cache.stats()["hits"] == 1
+
+def test_memory_hits_stay_on_the_event_loop(monkeypatch):
+    cache = nasa_power.ClimatologyCache()
+    key = nasa_power.cache_key(20.0, 73.75, nasa_power.AGROCLIMATE_PARAMETERS)
+    cache.put(key, {"T2M": {"ANN": 24.1}})
+    monkeypatch.setattr(nasa_power, "climatology_cache", cache)
+
+    async def no_thread(*args, **kwargs):
+        raise AssertionError("a memory hit should not need a worker thread")
+
+    monkeypatch.setattr(nasa_power.asyncio, "to_thread", no_thread)
+    assert asyncio.run(nasa_power.fetch_climatology(20.01, 73.76)) == {"T2M": {"ANN": 24.1}}
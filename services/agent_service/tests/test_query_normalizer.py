@@ -0,0 +1,43 @@
+import asyncio
+import threading
+
+from agent_service import query_normalizer
+from agent_service.query_normalizer import canonical_crop, classify_intent, extract_location, location_cell, query_key
+
+def test_aliases_come_from_the_prediction_service_list():
+    aliases = query_normalizer.load_crop_aliases()
+    assert "paddy" in aliases["rice"]
+    assert canonical_crop("How do I grow paddy?") == "rice"
+    assert canonical_crop("Best kidney beans variety") == "kidneybeans"
+
+def test_two_crops_are_ambiguous():
+    assert canonical_crop("rice or maize in Nashik?") is None
+
+def test_location_from_label_and_preposition():
+    assert extract_location("crop: rice, location: Nashik, Maharashtra. Improve yield") == "Nashik, Maharashtra"
+    assert extract_location("Tips for Rice in Nashik, Maharashtra?") == "Nashik, Maharashtra"
+
+def test_coordinates_share_a_cell():
+    assert location_cell("lat: 19.99, lon: 73.78") == location_cell("(19.6, 73.6)")
+
+def test_query_key_ignores_wording():
+    first = query_key("yield_improvement_agent", "How can I improve paddy yield in Nashik with fertilizer?")
+    second = query_key("yield_improvement_agent", "Fertilizer plan to improve rice yield in Nashik")
+    assert first == second == ("yield_improvement_agent", "rice", "nashik", "fertilizer")
+    assert classify_intent("yield_improvement_agent", "pest and irrigation advice") == "overall"
+    assert query_key("yield_improvement_agent", "How can I improve yield?") is None
+
+def test_async_callers_load_aliases_off_the_event_loop(monkeypatch):
+    threads = []
+
+    def load():
+        threads.append(threading.current_thread())
+        return {"rice": ["paddy"]}
+
+    monkeypatch.setattr(query_normalizer, "load_crop_aliases", load)
+    monkeypatch.setattr(query_normalizer, "_crop_patterns", None)
+    monkeypatch.setattr(query_normalizer, "_next_load_attempt", 0.0)
+
+    asyncio.run(query_normalizer.ensure_crop_patterns())
+    assert threads and threads[0] is not threading.main_thread()
+    assert canonical_crop("paddy in Nashik") == "rice"
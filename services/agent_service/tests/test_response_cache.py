@@ -0,0 +1,90 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from agent_service import response_cache
+from agent_service.response_cache import ResponseCache
+
+KEY = ("seed_identifier_agent", "rice", "nashik", "suppliers")
+
+def test_hit_miss_and_expiry(tmp_path):
+    cache = ResponseCache({"seed_identifier_agent": 60}, db_path=str(tmp_path / "responses.db"))
+    assert cache.get(KEY) is None
+    cache.put(KEY, {"result": "Buy certified seed"}, miss_seconds=4.0)
+    assert cache.get(KEY) == {"result": "Buy certified seed"}
+
+    # A fresh process reads the answer back from SQLite.
+    reopened = ResponseCache({"seed_identifier_agent": 60}, db_path=str(tmp_path / "responses.db"))
+    assert reopened.get(KEY) == {"result": "Buy certified seed"}
+
+    expired = ResponseCache({"seed_identifier_agent": 0}, db_path=str(tmp_path / "responses.db"))
+    assert expired.get(KEY) is None
+
+    stats = cache.stats()["agents"]["seed_identifier_agent"]
+    assert (stats["hits"], stats["misses"], stats["estimated_seconds_saved"]) == (1, 1, 4.0)
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    cache = ResponseCache(response_cache.RESPONSE_CACHE_TTLS)
+    monkeypatch.setattr(response_cache, "response_cache", cache)
+    monkeypatch.setattr(response_cache, "_pending", {})
+    return cache
+
+def _call(call_id: str, agent: str = "yield_improvement_agent"):
+    tool = SimpleNamespace(name=agent, agent=SimpleNamespace(output_key="agrianalysis"))
+    return tool, SimpleNamespace(function_call_id=call_id, state={})
+
+def test_callbacks_store_a_miss_and_answer_the_repeat(fresh_cache):
+    args = {"request": "How can I improve paddy yield in Nashik with fertilizer?"}
+    repeat = {"request": "Fertilizer plan to improve rice yield in Nashik"}
+
+    async def turn():
+        tool, context = _call("first")
+        assert await response_cache.before_tool_callback(tool, args, context) is None
+        await response_cache.after_tool_callback(tool, args, context, "Apply 120 kg N/ha in splits.")
+
+        tool, context = _call("second")
+        answer = await response_cache.before_tool_callback(tool, repeat, context)
+        return answer, context.state
+
+    answer, state = asyncio.run(turn())
+    assert answer == {"result": "Apply 120 kg N/ha in splits."}
+    assert state == {"agrianalysis": "Apply 120 kg N/ha in splits."}
+    assert response_cache._pending == {}
+
+def test_callbacks_skip_errors_and_unclear_requests(fresh_cache):
+    args = {"request": "How can I improve paddy yield in Nashik?"}
+
+    async def turn():
+        tool, context = _call("failed")
+        await response_cache.before_tool_callback(tool, args, context)
+        await response_cache.after_tool_callback(tool, args, context, {"status": "error", "error_message": "boom"})
+        tool, context = _call("unclear")
+        await response_cache.before_tool_callback(tool, {"request": "How can I improve yield?"}, context)
+
+    asyncio.run(turn())
+    counters = fresh_cache.stats()["agents"]["yield_improvement_agent"]
+    assert (counters["misses"], counters["bypassed"]) == (1, 1)
+    assert fresh_cache.stats()["entries"] == 0
+
+def test_other_places_in_the_same_region_do_not_share_an_answer(fresh_cache):
+    nashik = {"request": "Where to buy certified seeds for Kharif rice in Nashik, Maharashtra"}
+    guwahati = {"request": "Where to buy certified seeds for Kharif rice in Guwahati, Assam"}
+
+    async def turn():
+        tool, context = _call("nashik", "seed_identifier_agent")
+        await response_cache.before_tool_callback(tool, nashik, context)
+        await response_cache.after_tool_callback(tool, nashik, context, "Nashik seed depot")
+        tool, context = _call("guwahati", "seed_identifier_agent")
+        return await response_cache.before_tool_callback(tool, guwahati, context)
+
+    assert asyncio.run(turn()) is None
+    assert response_cache.query_key("seed_identifier_agent", nashik["request"])[2] == "nashik maharashtra"
+    assert response_cache.query_key("seed_identifier_agent", guwahati["request"])[2] == "guwahati assam"
+
+def test_keys_drop_seasons_and_skip_several_places():
+    key = response_cache.query_key("yield_improvement_agent", "How to improve rice yield in Pune During Summer")
+    assert key[2] == "pune"
+    assert response_cache.query_key("seed_identifier_agent", "Best rice variety for Kharif") is None
+    assert response_cache.query_key("seed_identifier_agent", "Rice seeds in Nashik or in Pune?") is None
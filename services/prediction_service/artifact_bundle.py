@@ -0,0 +1,79 @@
+"""
+Versioned, memory-mappable bundle of everything the prediction service loads at startup.
+
+A bundle is a directory with:
+- manifest.json: format version, column orders, crop names and the layout of every array
+- arrays.bin: raw little-endian float64 arrays (scaler means/scales, crop requirement
+  matrix), each aligned to 64 bytes
+- model.ubj: the XGBoost model in UBJSON form
+
+Reading the arrays needs only NumPy (arrays.bin is opened with np.memmap) instead of
+unpickling scalers.joblib and parsing the crop CSV. The arrays are a few hundred floats, so
+this saves startup work rather than memory; the model itself is still loaded into each worker
+unless PREDICTION_BACKEND=treelite.
+Bundles are written by export_bundle.py.
+"""
+import json
+import os
+from typing import Dict
+
+import numpy as np
+
+BUNDLE_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+ARRAYS_NAME = "arrays.bin"
+MODEL_NAME = "model.ubj"
+ALIGNMENT = 64
+
+def write_bundle(out_dir: str, arrays: Dict[str, np.ndarray], metadata: dict, model_bytes: bytes) -> None:
+    os.makedirs(out_dir, exist_ok=True)
+    layout = {}
+    offset = 0
+    with open(os.path.join(out_dir, ARRAYS_NAME), "wb") as f:
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array, dtype="<f8")
+            padding = -offset % ALIGNMENT
+            f.write(b"\0" * padding)
+            offset += padding
+            f.write(array.tobytes())
+            layout[name] = {"offset": offset, "shape": list(array.shape), "dtype": "<f8"}
+            offset += array.nbytes
+
+    with open(os.path.join(out_dir, MODEL_NAME), "wb") as f:
+        f.write(model_bytes)
+
+    manifest = {"format_version": BUNDLE_FORMAT_VERSION, "arrays": layout, **metadata}
+    with open(os.path.join(out_dir, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+class ArtifactBundle:
+    def __init__(self, directory: str, manifest: dict, arrays: Dict[str, np.ndarray]):
+        self.directory = directory
+        self.manifest = manifest
+        self.arrays = arrays
+
+    @classmethod
+    def open(cls, directory: str) -> "ArtifactBundle":
+        with open(os.path.join(directory, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+        if manifest.get("format_version") != BUNDLE_FORMAT_VERSION:
+            raise ValueError(
+                f"Artifact bundle format {manifest.get('format_version')} is not supported; expected {BUNDLE_FORMAT_VERSION}."
+            )
+
+        path = os.path.join(directory, ARRAYS_NAME)
+        arrays = {
+            name: np.memmap(path, dtype=spec["dtype"], mode="r", offset=spec["offset"], shape=tuple(spec["shape"]))
+            for name, spec in manifest["arrays"].items()
+        }
+        return cls(directory, manifest, arrays)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+
+    @property
+    def model_path(self) -> str:
+        """
+        Path of the serialized model. XGBoost reads it itself, so no copy is held in Python.
+        """
+        return os.path.join(self.directory, MODEL_NAME)
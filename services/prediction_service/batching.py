@@ -0,0 +1,122 @@
+"""
+Micro-batching scheduler for model inference.
+
+Concurrent requests submit their feature rows with `await batcher.predict(crop_rows, vectors)`.
+A background task takes the first submission and, if others are already queued behind it,
+keeps collecting until `max_batch_rows` rows are queued or `max_wait_ms` has passed since the
+first one arrived. A lone submission is dispatched at once. The batch runs as a single
+vectorized predict call on a worker thread, and each caller's future is resolved with its slice
+of the predictions.
+
+With an Instrumentation attached, each caller's request trace is captured on submission; the
+time it waited for its batch to start is recorded as the "batch_wait" stage, and the stages
+the batched predict call records are copied onto every request in the batch.
+"""
+import asyncio
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Optional
+
+import numpy as np
+
+class MicroBatcher:
+    def __init__(self, predict_fn: Callable, max_batch_rows: int = 64, max_wait_ms: float = 2.0,
+                 executor: Optional[Executor] = None, instrumentation=None):
+        self.predict_fn = predict_fn
+        self.instrumentation = instrumentation
+        self.max_batch_rows = max_batch_rows
+        self.max_wait_seconds = max_wait_ms / 1000
+        self.batches_run = 0
+        self.rows_predicted = 0
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="micro-batcher")
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        while self._queue and not self._queue.empty():
+            future = self._queue.get_nowait()[2]
+            if not future.done():
+                future.set_exception(RuntimeError("Prediction batcher stopped."))
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+    async def predict(self, crop_rows: list, environmental_vectors: list) -> np.ndarray:
+        future = asyncio.get_running_loop().create_future()
+        trace = self.instrumentation.current_trace() if self.instrumentation else None
+        await self._queue.put((crop_rows, environmental_vectors, future, trace, time.perf_counter()))
+        return await future
+
+    async def _collect(self) -> list:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        rows = len(batch[0][0])
+        # Nothing else pending: waiting would only add latency to an idle service.
+        if self._queue.empty():
+            return batch
+        deadline = loop.time() + self.max_wait_seconds
+        while rows < self.max_batch_rows:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.append(item)
+            rows += len(item[0])
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # Skip callers that gave up while waiting.
+            batch = [item for item in batch if not item[2].done()]
+            if not batch:
+                continue
+
+            crop_rows = [row for item in batch for row in item[0]]
+            vectors = [vector for item in batch for vector in item[1]]
+            predict = partial(self.predict_fn, crop_rows, vectors)
+            if self.instrumentation:
+                started = time.perf_counter()
+                traces = [item[3] for item in batch]
+                for item in batch:
+                    self.instrumentation.add_stage(item[3], "batch_wait", started - item[4])
+                predict = partial(self.instrumentation.run_shared, traces, predict)
+            try:
+                predictions = await loop.run_in_executor(self._executor, predict)
+            except Exception as e:
+                for _, _, future, _, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches_run += 1
+            self.rows_predicted += len(crop_rows)
+            offset = 0
+            for item_rows, _, future, _, _ in batch:
+                if not future.done():
+                    future.set_result(predictions[offset:offset + len(item_rows)])
+                offset += len(item_rows)
+
+    def stats(self) -> dict:
+        return {
+            "max_batch_rows": self.max_batch_rows,
+            "max_wait_ms": self.max_wait_seconds * 1000,
+            "batches_run": self.batches_run,
+            "rows_predicted": self.rows_predicted,
+            "mean_batch_rows": round(self.rows_predicted / self.batches_run, 2) if self.batches_run else 0.0
+        }
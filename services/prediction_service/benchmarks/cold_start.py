@@ -0,0 +1,81 @@
+"""
+Measures time from process (or container) start to the first successful response.
+
+By default it launches the service with uvicorn and polls --url until it answers 200. Pass
+--command to time something else, e.g. a container image:
+
+    python benchmarks/cold_start.py --runs 5
+    python benchmarks/cold_start.py --command "docker run --rm -p 8080:8080 --env-file .env prediction-service" \
+        --url http://127.0.0.1:8080/readyz
+
+Set STARTUP_MODE=lazy or eager in the environment to compare the two modes.
+"""
+import argparse
+import json
+import os
+import shlex
+import subprocess
+import sys
+import time
+
+import httpx
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def wait_for_response(process: subprocess.Popen, url: str, timeout: float, body: dict = None) -> float:
+    """
+    Polls url (a POST with body, else a GET) until it answers 200 and returns the perf_counter
+    time of that response. Fails if the process exits first.
+    """
+    deadline = time.perf_counter() + timeout
+    with httpx.Client(timeout=max(5.0, timeout)) as client:
+        while time.perf_counter() < deadline:
+            if process.poll() is not None:
+                raise SystemExit(f"Process exited with code {process.returncode} before {url} answered.")
+            try:
+                response = client.post(url, json=body) if body else client.get(url)
+                if response.status_code == 200:
+                    return time.perf_counter()
+            except httpx.TransportError:
+                pass
+            time.sleep(0.02)
+    raise SystemExit(f"No successful response from {url} within {timeout}s.")
+
+def stop_process(process: subprocess.Popen):
+    if process is None or process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+def time_to_first_response(command: list, url: str, timeout: float, body: dict = None) -> float:
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=SERVICE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        return wait_for_response(process, url, timeout, body) - start
+    finally:
+        stop_process(process)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--command", default=f"{sys.executable} -m uvicorn main:app --host 127.0.0.1 --port 8001")
+    parser.add_argument("--url", default="http://127.0.0.1:8001/readyz")
+    parser.add_argument("--predict", action="store_true", help="Poll with a POST /predict body instead of a GET")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    body = {"crop_name": "rice", "location_name": "Nashik, Maharashtra"} if args.predict else None
+    timings = [time_to_first_response(shlex.split(args.command), args.url, args.timeout, body) for _ in range(args.runs)]
+    print(json.dumps({
+        "startup_mode": os.getenv("STARTUP_MODE", "eager"),
+        "url": args.url,
+        "runs_seconds": [round(t, 3) for t in timings],
+        "best_seconds": round(min(timings), 3),
+        "mean_seconds": round(sum(timings) / len(timings), 3)
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
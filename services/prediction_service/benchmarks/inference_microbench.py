@@ -0,0 +1,70 @@
+"""
+Micro-benchmark of the per-row inference cost: the original pandas + DMatrix path against the
+precomputed, buffer-reusing inplace_predict path in main.predict_rows.
+
+Runs offline against the real model artifacts:
+
+    cd services/prediction_service
+    EE_BACKEND=fake python benchmarks/inference_microbench.py
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("EE_BACKEND", "fake")
+
+import main  # noqa: E402
+import pandas as pd  # noqa: E402
+import xgboost as xgb  # noqa: E402
+
+def predict_rows_dataframe(crop_rows, environmental_vectors):
+    """
+    The original per-request path: DataFrames for every stage, sklearn transform, DMatrix.
+    """
+    crop_keys = [main.crop_index.names[row] for row in crop_rows]
+    requirement_vectors = main.crop_vectors_df.loc[crop_keys, main.REQUIREMENT_COLS]
+    embedding_vectors = pd.DataFrame(environmental_vectors, columns=main.EMBEDDING_COLS)
+
+    scaled_req_features = main.req_scaler.transform(requirement_vectors)
+    scaled_emb_features = main.emb_scaler.transform(embedding_vectors)
+
+    full_feature_matrix = pd.DataFrame(
+        data=np.concatenate([scaled_req_features, scaled_emb_features], axis=1),
+        columns=main.FEATURE_COLS
+    )
+    return main.model.predict(xgb.DMatrix(full_feature_matrix))
+
+def time_per_row(predict, crop_rows, vectors, repeat: int) -> float:
+    predict(crop_rows, vectors)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        predict(crop_rows, vectors)
+    return (time.perf_counter() - start) / (repeat * len(crop_rows))
+
+def main_cli():
+    main.load_artifacts()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-sizes", default="1,10,100,1000")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    n_crops = len(main.crop_index)
+
+    print(f"{'rows':>6} {'dataframe us/row':>18} {'fast us/row':>12} {'speedup':>8} {'max abs diff':>13}")
+    for batch_size in [int(b) for b in args.batch_sizes.split(",")]:
+        crop_rows = [i % n_crops for i in range(batch_size)]
+        vectors = rng.standard_normal((batch_size, len(main.EMBEDDING_COLS))).tolist()
+        repeat = max(1, args.repeat // batch_size)
+
+        before = time_per_row(predict_rows_dataframe, crop_rows, vectors, repeat)
+        after = time_per_row(main.predict_rows, crop_rows, vectors, repeat)
+        diff = np.max(np.abs(predict_rows_dataframe(crop_rows, vectors) - main.predict_rows(crop_rows, vectors)))
+        print(f"{batch_size:>6} {before * 1e6:>18.1f} {after * 1e6:>12.1f} {before / after:>7.1f}x {diff:>13.2e}")
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,76 @@
+"""
+Closed-loop load test for POST /predict: keeps --concurrency requests in flight until
+--requests have completed, then prints p50/p99 latency and requests per second.
+
+Run it once against a service started with PREDICT_BATCHING=true and once with
+PREDICT_BATCHING=false to compare. Use the local stand-ins to avoid network access:
+
+    FAKE_GEOCODER_LATENCY_MS=0 uvicorn fakes.fake_geocoder:app --port 8101 &
+    EE_BACKEND=fake GEOCODING_URL=http://127.0.0.1:8101/maps/api/geocode/json GOOGLE_GEOCODING_API_KEY=fake \
+        PREDICT_BATCHING=true uvicorn main:app --port 8001 &
+    python benchmarks/load_test.py --label batching-on
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+import numpy as np
+
+CROPS = ["coffee", "banana", "kidneybeans", "chickpea", "coconut", "cotton", "lentil", "maize", "pigeonpeas", "rice"]
+
+async def worker(client: httpx.AsyncClient, url: str, counter: list, total: int, latencies: list, errors: list,
+                 locations: int, prefix: str):
+    while counter[0] < total:
+        i = counter[0]
+        counter[0] += 1
+        body = {"crop_name": CROPS[i % len(CROPS)], "location_name": f"{prefix} {i % locations}, Maharashtra"}
+        start = time.perf_counter()
+        response = await client.post(url, json=body)
+        latencies.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            errors.append(response.status_code)
+
+async def run(url: str, concurrency: int, total: int, locations: int = 50, prefix: str = "Village") -> dict:
+    """
+    Runs the closed loop. Requests cycle through `locations` distinct place names, so a value
+    at least `total` makes every request miss the service's geocode and embedding caches.
+    """
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+        # Warm up the service caches and connection pool.
+        await client.post(url, json={"crop_name": "rice", "location_name": f"{prefix} warmup, Maharashtra"})
+        counter, latencies, errors = [0], [], []
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            worker(client, url, counter, total, latencies, errors, locations, prefix) for _ in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "locations": locations,
+        "errors": len(errors),
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 2),
+        "p99_ms": round(float(np.percentile(latencies_ms, 99)), 2),
+        "requests_per_second": round(total / elapsed, 1)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8001/predict")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--locations", type=int, default=50, help="Distinct place names to cycle through")
+    parser.add_argument("--label", default="", help="Free-form tag stored with the result, e.g. batching-on")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.url, args.concurrency, args.requests, args.locations))
+    result["label"] = args.label
+    print(json.dumps(result, indent=2))
+
+if __name__ == "__main__":
+    main()
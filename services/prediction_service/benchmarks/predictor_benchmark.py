@@ -0,0 +1,74 @@
+"""
+Compares the XGBoost Booster with the compiled treelite predictor on CPU: single-row latency
+(p50/p99) and batch throughput, plus the maximum prediction difference.
+
+Build the library first with compile_model.py. To approximate a Cloud Run instance, pin the
+process to the vCPUs it would get and match --threads, e.g. for a 2 vCPU service:
+
+    taskset -c 0,1 python benchmarks/predictor_benchmark.py --threads 2
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import xgboost as xgb
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from predictors import TreelitePredictor, XGBoostPredictor  # noqa: E402
+
+FEATURE_COUNT = 7 + 64
+
+def single_row_latency(predictor, rows: np.ndarray) -> dict:
+    predictor.predict(rows[:1])
+    timings = []
+    for i in range(len(rows)):
+        start = time.perf_counter()
+        predictor.predict(rows[i:i + 1])
+        timings.append(time.perf_counter() - start)
+    timings = np.array(timings) * 1e6
+    return {"p50_us": round(float(np.percentile(timings, 50)), 1), "p99_us": round(float(np.percentile(timings, 99)), 1)}
+
+def batch_throughput(predictor, rows: np.ndarray, batch_size: int, repeat: int) -> float:
+    batch = np.ascontiguousarray(rows[:batch_size])
+    predictor.predict(batch)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        predictor.predict(batch)
+    return batch_size * repeat / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="assets/xgboost_yield_model.json")
+    parser.add_argument("--library", default="assets/yield_predictor.so")
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--single-rows", type=int, default=2000)
+    parser.add_argument("--batch-sizes", default="10,100,1000,10000")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    booster = xgb.Booster()
+    booster.load_model(args.model)
+    booster.set_param({"nthread": args.threads})
+    predictors = [XGBoostPredictor(booster), TreelitePredictor(args.library, nthread=args.threads)]
+
+    batch_sizes = [int(b) for b in args.batch_sizes.split(",")]
+    rows = np.random.default_rng(0).standard_normal((max(batch_sizes + [args.single_rows]), FEATURE_COUNT)).astype(np.float32)
+
+    report = {"threads": args.threads, "backends": {}}
+    for predictor in predictors:
+        report["backends"][predictor.name] = {
+            "single_row": single_row_latency(predictor, rows[:args.single_rows]),
+            "rows_per_second": {
+                str(size): round(batch_throughput(predictor, rows, size, args.repeat))
+                for size in batch_sizes
+            }
+        }
+    report["max_abs_diff"] = float(np.max(np.abs(predictors[0].predict(rows) - predictors[1].predict(rows))))
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""
+Offline end-to-end benchmark suite for the prediction service.
+
+Starts the fake geocoder and the service (with the real model artifacts from assets/ or
+ARTIFACT_BUNDLE_DIR and the fake Earth Engine backend) as local processes, each stand-in with
+its own injected latency, then measures:
+
+- cold start: time from process start to /readyz and to the first successful /predict
+- stages: sequential cache-missing /predict calls, broken down by the Server-Timing stages
+- concurrency: closed-loop /predict throughput and latency at each concurrency level
+- batch: /predict/batch latency and items per second at each batch size
+
+Results are written as JSON, tagged with the git commit, so runs can be compared across commits:
+
+    python benchmarks/suite.py --geocoder-latency-ms 80 --ee-latency-ms 250 --output bench-results/$(git rev-parse --short HEAD).json
+    python benchmarks/suite.py --env PREDICT_BATCHING=false --label batching-off
+
+No network access or credentials are needed.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+import numpy as np
+
+from cold_start import stop_process, wait_for_response
+from load_test import CROPS, run as run_load_test
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Persistent caches would let one run warm the next; the suite always starts from empty ones.
+ISOLATED_ENV_VARS = ("GEOCODE_CACHE_DB", "EMBEDDING_CACHE_SNAPSHOT")
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SERVICE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def percentiles(values_ms: list) -> dict:
+    values = np.asarray(values_ms, dtype=float)
+    return {
+        "p50_ms": round(float(np.percentile(values, 50)), 2),
+        "p90_ms": round(float(np.percentile(values, 90)), 2),
+        "p99_ms": round(float(np.percentile(values, 99)), 2),
+        "mean_ms": round(float(values.mean()), 2)
+    }
+
+def parse_server_timing(header: str) -> dict:
+    """
+    Parses "geocode;dur=12.30, embedding;dur=250.10, total;dur=263.00" into {stage: ms}.
+    """
+    stages = {}
+    for entry in filter(None, (part.strip() for part in header.split(","))):
+        name, _, params = entry.partition(";")
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "dur":
+                stages[name] = stages.get(name, 0.0) + float(value)
+    return stages
+
+class ServiceProcesses:
+    """
+    The fake geocoder and the prediction service as uvicorn subprocesses on free local ports.
+    """
+    def __init__(self, geocoder_latency_ms: float, ee_latency_ms: float, extra_env: dict):
+        self.geocoder_port = free_port()
+        self.service_port = free_port()
+        self.base_url = f"http://127.0.0.1:{self.service_port}"
+        self.geocoder_env = {**os.environ, "FAKE_GEOCODER_LATENCY_MS": str(geocoder_latency_ms)}
+        self.service_env = {k: v for k, v in os.environ.items() if k not in ISOLATED_ENV_VARS}
+        self.service_env.update({
+            "EE_BACKEND": "fake",
+            "FAKE_EE_LATENCY_MS": str(ee_latency_ms),
+            "GEOCODING_URL": f"http://127.0.0.1:{self.geocoder_port}/maps/api/geocode/json",
+            "GOOGLE_GEOCODING_API_KEY": "fake",
+            "METRICS_ENABLED": "true",
+            **extra_env
+        })
+        self.geocoder = None
+        self.service = None
+
+    def _uvicorn(self, app: str, port: int, env: dict) -> subprocess.Popen:
+        return subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", app, "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+            cwd=SERVICE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+
+    def start_geocoder(self, timeout: float):
+        self.geocoder = self._uvicorn("fakes.fake_geocoder:app", self.geocoder_port, self.geocoder_env)
+        wait_for_response(self.geocoder, f"http://127.0.0.1:{self.geocoder_port}/docs", timeout)
+
+    def start_service(self) -> float:
+        """
+        Launches the service and returns its start time on the perf_counter clock.
+        """
+        start = time.perf_counter()
+        self.service = self._uvicorn("main:app", self.service_port, self.service_env)
+        return start
+
+    def stop_service(self):
+        stop_process(self.service)
+        self.service = None
+
+    def stop(self):
+        stop_process(self.service)
+        stop_process(self.geocoder)
+
+def measure_cold_start(services: ServiceProcesses, runs: int, timeout: float) -> dict:
+    ready, first_prediction = [], []
+    for i in range(runs):
+        start = services.start_service()
+        try:
+            ready.append(wait_for_response(services.service, f"{services.base_url}/readyz", timeout) - start)
+            body = {"crop_name": "rice", "location_name": f"Cold start {i}, Maharashtra"}
+            first_prediction.append(wait_for_response(services.service, f"{services.base_url}/predict", timeout, body) - start)
+        finally:
+            services.stop_service()
+    return {
+        "runs": runs,
+        "startup_mode": services.service_env.get("STARTUP_MODE", "eager"),
+        "ready_seconds": [round(t, 3) for t in ready],
+        "first_prediction_seconds": [round(t, 3) for t in first_prediction],
+        "best_ready_seconds": round(min(ready), 3),
+        "best_first_prediction_seconds": round(min(first_prediction), 3)
+    }
+
+def measure_stages(base_url: str, requests: int, nonce: str) -> dict:
+    """
+    Sends sequential /predict calls with distinct place names so every call misses the caches.
+    """
+    client_ms, stages = [], {}
+    with httpx.Client(timeout=60) as client:
+        for i in range(requests):
+            body = {"crop_name": CROPS[i % len(CROPS)], "location_name": f"Stage {nonce} {i}, Maharashtra"}
+            start = time.perf_counter()
+            response = client.post(f"{base_url}/predict", json=body)
+            client_ms.append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+            for name, ms in parse_server_timing(response.headers.get("Server-Timing", "")).items():
+                stages.setdefault(name, []).append(ms)
+    return {
+        "requests": requests,
+        "client": percentiles(client_ms),
+        "server_stages": {name: percentiles(values) for name, values in sorted(stages.items())}
+    }
+
+def measure_concurrency(base_url: str, levels: list, requests: int, cold: bool, nonce: str) -> list:
+    results = []
+    for level in levels:
+        locations = requests if cold else 50
+        prefix = f"Load {nonce} c{level}" if cold else "Village"
+        results.append(asyncio.run(run_load_test(f"{base_url}/predict", level, requests, locations, prefix)))
+    return results
+
+def measure_batch(base_url: str, sizes: list, repeats: int, nonce: str) -> list:
+    results = []
+    with httpx.Client(timeout=300) as client:
+        for size in sizes:
+            timings = []
+            for repeat in range(repeats):
+                items = [
+                    {"crop_name": CROPS[i % len(CROPS)], "location_name": f"Batch {nonce} {size}-{repeat}-{i}, Maharashtra"}
+                    for i in range(size)
+                ]
+                start = time.perf_counter()
+                response = client.post(f"{base_url}/predict/batch", json={"items": items})
+                timings.append(time.perf_counter() - start)
+                response.raise_for_status()
+            best = min(timings)
+            results.append({
+                "items": size,
+                "repeats": repeats,
+                "best_seconds": round(best, 4),
+                "median_seconds": round(float(np.median(timings)), 4),
+                "items_per_second": round(size / best, 1),
+                "ms_per_item": round(best * 1000 / size, 3)
+            })
+    return results
+
+def parse_env(pairs: list) -> dict:
+    env = {}
+    for pair in pairs:
+        key, sep, value = pair.partition("=")
+        if not sep:
+            raise SystemExit(f"--env expects KEY=VALUE, got '{pair}'")
+        env[key] = value
+    return env
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--geocoder-latency-ms", type=float, default=80)
+    parser.add_argument("--ee-latency-ms", type=float, default=250)
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="Extra service environment, e.g. PREDICT_BATCHING=false (repeatable)")
+    parser.add_argument("--cold-start-runs", type=int, default=3)
+    parser.add_argument("--stage-requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--concurrency-requests", type=int, default=500)
+    parser.add_argument("--warm", action="store_true", help="Let concurrency requests reuse 50 cached locations")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--batch-repeats", type=int, default=3)
+    parser.add_argument("--startup-timeout", type=float, default=120)
+    parser.add_argument("--label", default="", help="Free-form tag stored with the result")
+    parser.add_argument("--output", default="-", help="JSON output path, or - for stdout")
+    args = parser.parse_args()
+
+    extra_env = parse_env(args.env)
+    services = ServiceProcesses(args.geocoder_latency_ms, args.ee_latency_ms, extra_env)
+    nonce = uuid.uuid4().hex[:8]
+    results = {}
+    try:
+        services.start_geocoder(args.startup_timeout)
+        if args.cold_start_runs:
+            print("Measuring cold start...", file=sys.stderr)
+            results["cold_start"] = measure_cold_start(services, args.cold_start_runs, args.startup_timeout)
+
+        services.start_service()
+        wait_for_response(services.service, f"{services.base_url}/readyz", args.startup_timeout)
+
+        print("Measuring per-stage latency...", file=sys.stderr)
+        results["stages"] = measure_stages(services.base_url, args.stage_requests, nonce)
+        print("Measuring concurrent throughput...", file=sys.stderr)
+        results["concurrency"] = measure_concurrency(
+            services.base_url, args.concurrency, args.concurrency_requests, not args.warm, nonce
+        )
+        print("Measuring batch scaling...", file=sys.stderr)
+        results["batch"] = measure_batch(services.base_url, args.batch_sizes, args.batch_repeats, nonce)
+    finally:
+        services.stop()
+
+    report = {
+        "label": args.label,
+        "git_commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "config": {
+            "geocoder_latency_ms": args.geocoder_latency_ms,
+            "ee_latency_ms": args.ee_latency_ms,
+            "service_env": extra_env,
+            "concurrency_cache": "warm" if args.warm else "cold"
+        },
+        "results": results
+    }
+    output = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(output)
+    else:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+        print(f"Wrote {args.output}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Compiles assets/xgboost_yield_model.json into a native predictor library with treelite and
+tl2cgen, then checks that it matches the XGBoost Booster on random feature rows.
+
+Usage:
+    pip install treelite tl2cgen
+    python compile_model.py --out assets/yield_predictor.so
+    PREDICTION_BACKEND=treelite PREDICTOR_LIBRARY=assets/yield_predictor.so uvicorn main:app
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import tl2cgen
+import treelite
+import xgboost as xgb
+
+from predictors import TreelitePredictor, XGBoostPredictor
+
+FEATURE_COUNT = 7 + 64
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="assets/xgboost_yield_model.json")
+    parser.add_argument("--out", default="assets/yield_predictor.so")
+    parser.add_argument("--toolchain", default="gcc")
+    parser.add_argument("--parallel-comp", type=int, default=os.cpu_count() or 1, help="Number of C files to split the trees into")
+    parser.add_argument("--tolerance", type=float, default=1e-4)
+    parser.add_argument("--check-rows", type=int, default=10000)
+    args = parser.parse_args()
+
+    model = treelite.frontend.load_xgboost_model(args.model)
+    tl2cgen.export_lib(
+        model,
+        toolchain=args.toolchain,
+        libpath=args.out,
+        params={"parallel_comp": args.parallel_comp, "quantize": 1}
+    )
+    print(f"Compiled {args.model} -> {args.out}")
+
+    booster = xgb.Booster()
+    booster.load_model(args.model)
+    # Scaled features are roughly standard normal, so this covers the split thresholds in use.
+    features = np.random.default_rng(0).standard_normal((args.check_rows, FEATURE_COUNT)).astype(np.float32)
+    expected = XGBoostPredictor(booster).predict(features)
+    actual = TreelitePredictor(args.out, nthread=os.cpu_count() or 1).predict(features)
+
+    max_diff = float(np.max(np.abs(expected - actual)))
+    print(f"Max abs difference vs Booster over {args.check_rows} rows: {max_diff:.2e}")
+    if max_diff > args.tolerance:
+        print(f"FAIL: difference exceeds tolerance {args.tolerance}")
+        sys.exit(1)
+    print("✅ Compiled predictor matches the Booster")
+
+if __name__ == "__main__":
+    main()
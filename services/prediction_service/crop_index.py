@@ -0,0 +1,72 @@
+"""
+Immutable lookup index over the supported crops, built once at startup.
+
+Every crop is addressed by its row offset in crop_requirement_vectors.csv, which is also its
+row in the precomputed scaled requirement matrix. Names are matched after lowercasing and
+dropping spaces, hyphens and underscores, so "Kidney Beans" and "kidney-beans" both resolve
+to kidneybeans; the canonical name, the Kaggle name, the SPAM code and the common aliases in
+CROP_ALIASES all map to the same row.
+
+CROP_ALIASES is read from assets/crop_aliases.json, the single list of crop aliases; the agent
+service's query normalizer reads the same file (or fetches it from GET /crops).
+"""
+import json
+import os
+import re
+from types import MappingProxyType
+from typing import Optional
+
+import numpy as np
+
+CROP_ALIASES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "crop_aliases.json")
+
+# Local and plural names farmers commonly use for the supported crops.
+with open(CROP_ALIASES_PATH) as f:
+    CROP_ALIASES = MappingProxyType(json.load(f))
+
+_SEPARATORS = re.compile(r"[\s\-_]+")
+
+def normalize_crop_name(crop_name: str) -> str:
+    return _SEPARATORS.sub("", crop_name.strip().lower())
+
+class CropIndex:
+    def __init__(self, names: list, alternate_names: list, requirements: np.ndarray, requirement_cols: list, scaled_requirements: np.ndarray):
+        """
+        names: canonical crop names in row order.
+        alternate_names: per row, other names the crop is known by (Kaggle name, SPAM code).
+        requirements: unscaled requirement matrix, one row per crop in requirement_cols order.
+        """
+        self.names = tuple(names)
+        self.available_crops = ", ".join(self.names)
+
+        offsets = {}
+        for row, name in enumerate(self.names):
+            for key in [name] + list(alternate_names[row]) + CROP_ALIASES.get(name, []):
+                offsets.setdefault(normalize_crop_name(str(key)), row)
+        self.offsets = MappingProxyType(offsets)
+
+        # Response payloads are shared across requests and must not be mutated.
+        self.requirements = tuple(
+            {col: float(value) for col, value in zip(requirement_cols, values)}
+            for values in np.asarray(requirements)
+        )
+
+        self.scaled_requirements = np.ascontiguousarray(scaled_requirements, dtype=np.float32)
+        self.scaled_requirements.setflags(write=False)
+
+    @classmethod
+    def from_dataframe(cls, crop_vectors_df, requirement_cols: list, scaled_requirements: np.ndarray) -> "CropIndex":
+        alternate_cols = [col for col in ("kaggle_name", "spam_code") if col in crop_vectors_df.columns]
+        return cls(
+            list(crop_vectors_df.index),
+            crop_vectors_df[alternate_cols].to_numpy().tolist(),
+            crop_vectors_df[requirement_cols].to_numpy(),
+            requirement_cols,
+            scaled_requirements
+        )
+
+    def resolve(self, crop_name: str) -> Optional[int]:
+        return self.offsets.get(normalize_crop_name(crop_name))
+
+    def __len__(self) -> int:
+        return len(self.names)
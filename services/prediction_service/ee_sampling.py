@@ -0,0 +1,140 @@
+"""
+Batched Earth Engine sampling of satellite embeddings.
+
+Ports the FeatureCollection approach from the data-prep notebook's get_alphaearth_embeddings():
+many points go to Earth Engine as one FeatureCollection, each is sampled server-side, and the
+results come back in a single getInfo() round trip. Large requests are split into chunks of
+`batch_size` points that run concurrently on a bounded thread pool, and results are mapped
+back to the caller's ids.
+
+Backends implement `sample(points) -> {point_id: vector or None}`, where `points` is a list of
+(point_id, lat, lon, year). Points for different years go in the same request; each is sampled
+from its own annual image server-side. EarthEngineBackend talks to Earth Engine;
+fakes/fake_earth_engine.py provides an offline stand-in.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+EMBEDDING_COLLECTION = 'GOOGLE/SATELLITE_EMBEDDING/V1/ANNUAL'
+EMBEDDING_COLS = [f'A{i:02d}' for i in range(64)]
+
+Point = Tuple[Hashable, float, float, int]
+
+class EarthEngineBackend:
+    def __init__(self, collection: str = EMBEDDING_COLLECTION):
+        self.collection = collection
+
+    def sample(self, points: List[Point]) -> Dict[Hashable, Optional[list]]:
+        import ee
+
+        collection = ee.ImageCollection(self.collection).select(EMBEDDING_COLS)
+
+        # Ids are sent as list indices so any hashable caller id can be mapped back.
+        features = [
+            ee.Feature(ee.Geometry.Point(lon, lat), {'point_index': i, 'year': year})
+            for i, (_, lat, lon, year) in enumerate(points)
+        ]
+
+        def sample_point(feature):
+            start = ee.Date.fromYMD(ee.Number(feature.get('year')), 1, 1)
+            image_for_point = collection.filterDate(start, start.advance(1, 'year')) \
+                                        .filterBounds(feature.geometry()) \
+                                        .first()
+
+            def perform_sampling(img):
+                sampled_feature = ee.Image(img).sample(region=feature.geometry(), scale=10).first()
+                # A tile can exist while the pixel under the point is NODATA.
+                return ee.Algorithms.If(
+                    sampled_feature,
+                    feature.copyProperties(sampled_feature),
+                    feature.set('A00', None)
+                )
+
+            return ee.Algorithms.If(
+                image_for_point,
+                perform_sampling(image_for_point),
+                feature.set('A00', None)
+            )
+
+        results = ee.FeatureCollection(features).map(sample_point).getInfo()
+
+        vectors = {point[0]: None for point in points}
+        for feature in results['features']:
+            props = feature.get('properties', {})
+            vector = [props.get(band) for band in EMBEDDING_COLS]
+            if None not in vector:
+                vectors[points[props['point_index']][0]] = vector
+        return vectors
+
+def annual_mosaic(year: int, collection: str = EMBEDDING_COLLECTION):
+    """
+    Returns the year's embedding image, mosaicked across tiles, with bands A00..A63.
+    """
+    import ee
+
+    return ee.ImageCollection(collection) \
+             .filterDate(f'{year}-01-01', f'{year + 1}-01-01') \
+             .select(EMBEDDING_COLS) \
+             .mosaic()
+
+def mask_nodata(tile: np.ndarray) -> np.ndarray:
+    """
+    Sets pixels that are 0 in every band to NaN, in place. computePixels returns masked pixels
+    as all zeros, which no real unit-length embedding is.
+    """
+    tile[~np.any(tile != 0, axis=-1)] = np.nan
+    return tile
+
+def fetch_pixel_tile(image, west: float, north: float, width: int, height: int, resolution_deg: float) -> np.ndarray:
+    """
+    Reads a (height, width, 64) float32 block of pixels on an EPSG:4326 grid with one
+    ee.data.computePixels call. Pixels without data come back as 0 in every band; pass the
+    tile through mask_nodata to turn them into NaN.
+    """
+    import ee
+
+    pixels = ee.data.computePixels({
+        "expression": image,
+        "fileFormat": "NUMPY_NDARRAY",
+        "grid": {
+            "dimensions": {"width": width, "height": height},
+            "affineTransform": {
+                "scaleX": resolution_deg,
+                "shearX": 0,
+                "translateX": west,
+                "shearY": 0,
+                "scaleY": -resolution_deg,
+                "translateY": north
+            },
+            "crsCode": "EPSG:4326"
+        }
+    })
+    # computePixels returns a structured array with one field per band.
+    return np.stack([pixels[band] for band in EMBEDDING_COLS], axis=-1).astype(np.float32)
+
+class BatchedEmbeddingSampler:
+    def __init__(self, backend, batch_size: int = 1000, max_workers: int = 4):
+        self.backend = backend
+        self.batch_size = batch_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ee-sampler")
+
+    def sample(self, points: List[Point]) -> Dict[Hashable, Optional[list]]:
+        """
+        Samples every (point_id, lat, lon, year), returning {point_id: 64-value list, or None
+        where no data exists}.
+        """
+        if not points:
+            return {}
+        chunks = [points[i:i + self.batch_size] for i in range(0, len(points), self.batch_size)]
+        if len(chunks) == 1:
+            return self.backend.sample(chunks[0])
+
+        vectors = {}
+        for chunk_vectors in self._executor.map(self.backend.sample, chunks):
+            vectors.update(chunk_vectors)
+        return vectors
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,101 @@
+"""
+Memory-bounded LRU cache of satellite embedding vectors.
+
+Entries are keyed by (collection, year, snapped row, snapped col), where the point is snapped
+to a grid of `grid_deg` degrees, so requests that land in the same sampling cell share one
+Earth Engine lookup. Vectors are stored as float32 arrays and the cache evicts least recently
+used entries once their total size exceeds `max_bytes`.
+
+Snapshots written with save() can be loaded at startup to pre-warm the cache; see
+warm_embedding_cache.py.
+"""
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Approximate per-entry overhead of the key tuple, OrderedDict node and ndarray header.
+ENTRY_OVERHEAD_BYTES = 256
+
+CellKey = Tuple[str, int, int, int]
+
+class EmbeddingCache:
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, grid_deg: float = 0.0001):
+        self.max_bytes = max_bytes
+        self.grid_deg = grid_deg
+        self.hits = 0
+        self.misses = 0
+        self.size_bytes = 0
+        self._entries: "OrderedDict[CellKey, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, collection: str, year: int, lat: float, lon: float) -> CellKey:
+        return (collection, year, int(np.floor(lat / self.grid_deg)), int(np.floor(lon / self.grid_deg)))
+
+    def get(self, collection: str, year: int, lat: float, lon: float) -> Optional[np.ndarray]:
+        key = self.key(collection, year, lat, lon)
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, collection: str, year: int, lat: float, lon: float, vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        key = self.key(collection, year, lat, lon)
+        with self._lock:
+            self._store(key, vector)
+        return vector
+
+    def _store(self, key: CellKey, vector: np.ndarray) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size_bytes -= previous.nbytes + ENTRY_OVERHEAD_BYTES
+        self._entries[key] = vector
+        self.size_bytes += vector.nbytes + ENTRY_OVERHEAD_BYTES
+        while self.size_bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self.size_bytes -= evicted.nbytes + ENTRY_OVERHEAD_BYTES
+
+    def save(self, path: str) -> None:
+        """
+        Writes all entries to an .npz snapshot.
+        """
+        with self._lock:
+            keys = list(self._entries.keys())
+            vectors = np.stack(list(self._entries.values())) if keys else np.empty((0, 0), dtype=np.float32)
+        np.savez(
+            path,
+            collections=np.array([k[0] for k in keys], dtype=str),
+            cells=np.array([k[1:] for k in keys], dtype=np.int64).reshape(-1, 3),
+            vectors=vectors,
+            grid_deg=np.array(self.grid_deg)
+        )
+
+    def load(self, path: str) -> int:
+        """
+        Loads a snapshot written by save(). Returns the number of entries loaded.
+        """
+        snapshot = np.load(path)
+        if float(snapshot["grid_deg"]) != self.grid_deg:
+            raise ValueError(f"Snapshot grid {float(snapshot['grid_deg'])} does not match cache grid {self.grid_deg}.")
+        with self._lock:
+            for collection, cell, vector in zip(snapshot["collections"], snapshot["cells"], snapshot["vectors"]):
+                self._store((str(collection), int(cell[0]), int(cell[1]), int(cell[2])), vector.astype(np.float32))
+        return len(snapshot["cells"])
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "grid_deg": self.grid_deg,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
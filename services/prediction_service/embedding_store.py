@@ -0,0 +1,106 @@
+"""
+Local, memory-mapped store of precomputed satellite embeddings.
+
+A store is a directory holding `manifest.json` plus one `.npy` array per region, shaped
+(rows, cols, 64) in float32 with NaN for pixels that have no data. Arrays are opened with
+mmap_mode='r', so a lookup touches a single 256-byte row of one file and the OS page cache
+is shared between worker processes. Stores are produced by ingest_embeddings.py.
+
+manifest.json:
+    {
+      "collection": "GOOGLE/SATELLITE_EMBEDDING/V1/ANNUAL",
+      "year": 2023,
+      "bands": ["A00", ..., "A63"],
+      "regions": [
+        {"name": "nashik", "file": "nashik.npy", "west": 73.4, "south": 19.6,
+         "east": 74.4, "north": 20.6, "resolution_deg": 0.0001}
+      ]
+    }
+"""
+import json
+import os
+from typing import List, Optional
+
+import numpy as np
+
+MANIFEST_NAME = "manifest.json"
+
+class EmbeddingRegion:
+    def __init__(self, name: str, array: np.ndarray, west: float, south: float, east: float, north: float, resolution_deg: float):
+        self.name = name
+        self.array = array
+        self.west = west
+        self.south = south
+        self.east = east
+        self.north = north
+        self.resolution_deg = resolution_deg
+
+    def contains(self, lat: float, lon: float) -> bool:
+        return self.south <= lat < self.north and self.west <= lon < self.east
+
+    def lookup(self, lat: float, lon: float) -> Optional[np.ndarray]:
+        row = int((self.north - lat) / self.resolution_deg)
+        col = int((lon - self.west) / self.resolution_deg)
+        if not (0 <= row < self.array.shape[0] and 0 <= col < self.array.shape[1]):
+            return None
+        vector = self.array[row, col]
+        if np.isnan(vector).any():
+            return None
+        return vector
+
+class EmbeddingTileStore:
+    def __init__(self, collection: str, year: int, bands: List[str], regions: List[EmbeddingRegion]):
+        self.collection = collection
+        self.year = year
+        self.bands = bands
+        self.regions = regions
+
+    @classmethod
+    def open(cls, directory: str) -> "EmbeddingTileStore":
+        with open(os.path.join(directory, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+
+        regions = []
+        for region in manifest["regions"]:
+            array = np.load(os.path.join(directory, region["file"]), mmap_mode="r")
+            if array.ndim != 3 or array.shape[2] != len(manifest["bands"]):
+                raise ValueError(f"Region '{region['name']}' has shape {array.shape}, expected (rows, cols, {len(manifest['bands'])}).")
+            regions.append(EmbeddingRegion(
+                name=region["name"],
+                array=array,
+                west=region["west"],
+                south=region["south"],
+                east=region["east"],
+                north=region["north"],
+                resolution_deg=region["resolution_deg"]
+            ))
+        return cls(manifest["collection"], manifest["year"], manifest["bands"], regions)
+
+    def lookup(self, lat: float, lon: float) -> Optional[np.ndarray]:
+        """
+        Returns the 64-band vector at a point, or None if the point is outside every region
+        or falls on a no-data pixel.
+        """
+        for region in self.regions:
+            if region.contains(lat, lon):
+                return region.lookup(lat, lon)
+        return None
+
+    def lookup_many(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """
+        Vectorized lookup for many points. Returns an (n, 64) float32 array with NaN rows for
+        points outside every region or on no-data pixels.
+        """
+        vectors = np.full((len(lats), len(self.bands)), np.nan, dtype=np.float32)
+        pending = np.ones(len(lats), dtype=bool)
+        for region in self.regions:
+            inside = pending & (lats >= region.south) & (lats < region.north) & (lons >= region.west) & (lons < region.east)
+            if not inside.any():
+                continue
+            rows = ((region.north - lats[inside]) / region.resolution_deg).astype(np.int64)
+            cols = ((lons[inside] - region.west) / region.resolution_deg).astype(np.int64)
+            in_bounds = (rows < region.array.shape[0]) & (cols < region.array.shape[1])
+            targets = np.flatnonzero(inside)[in_bounds]
+            vectors[targets] = region.array[rows[in_bounds], cols[in_bounds]]
+            pending[targets] = False
+        return vectors
@@ -0,0 +1,68 @@
+"""
+Exports the model, scalers and crop requirement vectors into a single artifact bundle
+(see artifact_bundle.py) and checks that the bundle reproduces the joblib scalers.
+
+Usage:
+    python export_bundle.py --out assets/bundle
+    ARTIFACT_BUNDLE_DIR=assets/bundle uvicorn main:app
+"""
+import argparse
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from artifact_bundle import ArtifactBundle, write_bundle
+
+REQUIREMENT_COLS = ['N', 'P', 'K', 'temperature', 'humidity', 'ph', 'rainfall']
+EMBEDDING_COLS = [f'A{i:02d}' for i in range(64)]
+
+def scaler_arrays(scaler, width: int):
+    mean = scaler.mean_ if scaler.mean_ is not None else np.zeros(width)
+    scale = scaler.scale_ if scaler.scale_ is not None else np.ones(width)
+    return np.asarray(mean, dtype=np.float64), np.asarray(scale, dtype=np.float64)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="assets/xgboost_yield_model.json")
+    parser.add_argument("--scalers", default="assets/scalers.joblib")
+    parser.add_argument("--crops", default="assets/crop_requirement_vectors.csv")
+    parser.add_argument("--out", default="assets/bundle")
+    args = parser.parse_args()
+
+    booster = xgb.Booster()
+    booster.load_model(args.model)
+    scalers = joblib.load(args.scalers)
+    crop_vectors_df = pd.read_csv(args.crops).set_index('canonical_name')
+
+    arrays = {}
+    arrays["req_mean"], arrays["req_scale"] = scaler_arrays(scalers['req'], len(REQUIREMENT_COLS))
+    arrays["emb_mean"], arrays["emb_scale"] = scaler_arrays(scalers['emb'], len(EMBEDDING_COLS))
+    arrays["crop_requirements"] = crop_vectors_df[REQUIREMENT_COLS].to_numpy(dtype=np.float64)
+
+    metadata = {
+        "requirement_cols": REQUIREMENT_COLS,
+        "embedding_cols": EMBEDDING_COLS,
+        "feature_cols": REQUIREMENT_COLS + EMBEDDING_COLS,
+        "crops": {
+            "canonical_name": list(crop_vectors_df.index),
+            "kaggle_name": crop_vectors_df['kaggle_name'].tolist(),
+            "spam_code": crop_vectors_df['spam_code'].tolist()
+        }
+    }
+    write_bundle(args.out, arrays, metadata, bytes(booster.save_raw("ubj")))
+
+    # Round-trip check: the bundle must scale exactly like the fitted scalers.
+    bundle = ArtifactBundle.open(args.out)
+    requirements = crop_vectors_df[REQUIREMENT_COLS]
+    expected = scalers['req'].transform(requirements)
+    actual = (np.asarray(bundle["crop_requirements"]) - bundle["req_mean"]) / bundle["req_scale"]
+    if not np.allclose(expected, actual, rtol=0, atol=1e-12):
+        print("FAIL: bundle scaling differs from scalers.joblib")
+        sys.exit(1)
+    print(f"✅ Wrote artifact bundle to {args.out}")
+
+if __name__ == "__main__":
+    main()
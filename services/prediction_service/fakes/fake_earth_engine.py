@@ -0,0 +1,42 @@
+"""
+Offline stand-in for the Earth Engine embedding backend.
+
+Produces a deterministic unit-length 64-band vector for every point, optionally sleeping for
+an injected latency per round trip, so ee_sampling.BatchedEmbeddingSampler and the service can
+run without credentials or network access. Points with |latitude| above `nodata_above_lat`
+behave like NODATA pixels and return None.
+"""
+import hashlib
+import os
+import threading
+import time
+
+import numpy as np
+
+class FakeEarthEngineBackend:
+    def __init__(self, latency_ms: float = None, nodata_above_lat: float = 80.0):
+        if latency_ms is None:
+            latency_ms = float(os.getenv("FAKE_EE_LATENCY_MS", "0"))
+        self.latency_ms = latency_ms
+        self.nodata_above_lat = nodata_above_lat
+        self.calls = 0
+        self.points_sampled = 0
+        self._lock = threading.Lock()
+
+    def vector_for(self, lat: float, lon: float, year: int) -> list:
+        # Snap to ~10 m so points in the same pixel share a vector, as in Earth Engine.
+        seed = hashlib.sha256(f"{round(lat, 4)}:{round(lon, 4)}:{year}".encode("utf-8")).digest()
+        rng = np.random.default_rng(int.from_bytes(seed[:8], "big"))
+        vector = rng.standard_normal(64)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def sample(self, points):
+        with self._lock:
+            self.calls += 1
+            self.points_sampled += len(points)
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return {
+            point_id: None if abs(lat) > self.nodata_above_lat else self.vector_for(lat, lon, year)
+            for point_id, lat, lon, year in points
+        }
@@ -0,0 +1,53 @@
+"""
+Local stand-in for the Google Geocoding REST API.
+
+Returns deterministic coordinates for any address and sleeps for a configurable
+latency before answering, so the prediction service can be exercised without
+network access or an API key.
+
+    FAKE_GEOCODER_LATENCY_MS=500 uvicorn fakes.fake_geocoder:app --port 8101
+    GEOCODING_URL=http://127.0.0.1:8101/maps/api/geocode/json GOOGLE_GEOCODING_API_KEY=fake \
+        uvicorn main:app --port 8001
+"""
+import asyncio
+import hashlib
+import os
+
+from fastapi import FastAPI
+
+LATENCY_MS = float(os.getenv("FAKE_GEOCODER_LATENCY_MS", "0"))
+
+# Addresses containing this marker answer ZERO_RESULTS, to exercise the 404 path.
+NOT_FOUND_MARKER = "nowhere"
+# Addresses containing this marker answer OVER_QUERY_LIMIT, to exercise the quota error path.
+QUOTA_MARKER = "overquota"
+
+app = FastAPI(title="Fake Geocoding API")
+
+def fake_coordinates(address: str):
+    """
+    Maps an address to a stable point inside India's bounding box.
+    """
+    digest = hashlib.sha256(address.strip().lower().encode("utf-8")).digest()
+    lat = 8.0 + (int.from_bytes(digest[:4], "big") / 2**32) * 27.0
+    lng = 68.0 + (int.from_bytes(digest[4:8], "big") / 2**32) * 29.0
+    return round(lat, 6), round(lng, 6)
+
+@app.get("/maps/api/geocode/json")
+async def geocode(address: str, key: str = ""):
+    if LATENCY_MS:
+        await asyncio.sleep(LATENCY_MS / 1000)
+
+    if NOT_FOUND_MARKER in address.lower():
+        return {"status": "ZERO_RESULTS", "results": []}
+    if QUOTA_MARKER in address.lower():
+        return {"status": "OVER_QUERY_LIMIT", "results": [], "error_message": "You have exceeded your daily request quota."}
+
+    lat, lng = fake_coordinates(address)
+    return {
+        "status": "OK",
+        "results": [{
+            "formatted_address": f"{address.strip()}, India",
+            "geometry": {"location": {"lat": lat, "lng": lng}}
+        }]
+    }
@@ -0,0 +1,115 @@
+"""
+Two-tier cache for geocoding results.
+
+Keys are normalized location strings, so "Nashik, Maharashtra" and "  nashik maharashtra."
+share one entry. The in-process tier is an LRU bounded by entry count; the optional
+SQLite tier persists entries across container restarts. Both tiers honour the same TTL;
+expired SQLite rows are pruned when the cache opens and then at most once per prune interval.
+"""
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+# (latitude, longitude, formatted_address)
+GeocodeEntry = Tuple[float, float, str]
+
+_PUNCTUATION = re.compile(r"[^\w\s]", re.UNICODE)
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_location(location_name: str) -> str:
+    """
+    Lowercases, strips punctuation and collapses whitespace.
+    """
+    key = _PUNCTUATION.sub(" ", location_name.lower())
+    return _WHITESPACE.sub(" ", key).strip()
+
+class GeocodeCache:
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 30 * 24 * 3600, db_path: Optional[str] = None,
+                 prune_interval_seconds: float = 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.prune_interval_seconds = prune_interval_seconds
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, GeocodeEntry]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._next_prune = 0.0
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS geocode ("
+                "key TEXT PRIMARY KEY, latitude REAL, longitude REAL, address TEXT, stored_at REAL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS geocode_stored_at ON geocode (stored_at)")
+            self._prune(time.time())
+
+    def get(self, location_name: str) -> Optional[GeocodeEntry]:
+        key = normalize_location(location_name)
+        now = time.time()
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached and now - cached[0] < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+            if cached:
+                del self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT latitude, longitude, address, stored_at FROM geocode WHERE key = ?", (key,)
+                ).fetchone()
+                if row and now - row[3] < self.ttl_seconds:
+                    entry = (row[0], row[1], row[2])
+                    self._remember(key, row[3], entry)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return entry
+
+            self.misses += 1
+            return None
+
+    def put(self, location_name: str, entry: GeocodeEntry) -> None:
+        key = normalize_location(location_name)
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, entry)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO geocode (key, latitude, longitude, address, stored_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, entry[0], entry[1], entry[2], now)
+                )
+                if now >= self._next_prune:
+                    self._prune(now)
+                else:
+                    self._db.commit()
+
+    def _prune(self, now: float) -> None:
+        # Deletes expired rows through the stored_at index and commits.
+        self._db.execute("DELETE FROM geocode WHERE stored_at < ?", (now - self.ttl_seconds,))
+        self._db.commit()
+        self._next_prune = now + self.prune_interval_seconds
+
+    def _remember(self, key: str, stored_at: float, entry: GeocodeEntry) -> None:
+        self._entries[key] = (stored_at, entry)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "persistent": self._db is not None,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
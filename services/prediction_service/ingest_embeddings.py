@@ -0,0 +1,93 @@
+"""
+Offline ingestion of satellite embeddings into a local EmbeddingTileStore.
+
+Reads a JSON list of regions and exports the A00..A63 bands for each one from Earth Engine
+with ee.data.computePixels, tile by tile, straight into a memory-mapped .npy file. The
+output directory can then be set as EMBEDDING_STORE_DIR for the prediction service.
+
+regions.json:
+    [{"name": "nashik", "west": 73.4, "south": 19.6, "east": 74.4, "north": 20.6}]
+
+Usage:
+    python ingest_embeddings.py --regions regions.json --out embedding_store --year 2023
+"""
+import argparse
+import json
+import math
+import os
+
+import ee
+import numpy as np
+
+from ee_sampling import EMBEDDING_COLLECTION, EMBEDDING_COLS, annual_mosaic, fetch_pixel_tile, mask_nodata
+from embedding_store import MANIFEST_NAME
+
+def export_region(image, region: dict, resolution_deg: float, tile_size: int, out_dir: str) -> dict:
+    rows = math.ceil((region["north"] - region["south"]) / resolution_deg)
+    cols = math.ceil((region["east"] - region["west"]) / resolution_deg)
+    filename = f"{region['name']}.npy"
+    array = np.lib.format.open_memmap(
+        os.path.join(out_dir, filename), mode="w+", dtype=np.float32, shape=(rows, cols, len(EMBEDDING_COLS))
+    )
+    array[:] = np.nan
+
+    for row0 in range(0, rows, tile_size):
+        for col0 in range(0, cols, tile_size):
+            height = min(tile_size, rows - row0)
+            width = min(tile_size, cols - col0)
+            tile = fetch_pixel_tile(
+                image,
+                region["west"] + col0 * resolution_deg,
+                region["north"] - row0 * resolution_deg,
+                width,
+                height,
+                resolution_deg
+            )
+            # Masked pixels are stored as NaN, which the store reads as "no data".
+            array[row0:row0 + height, col0:col0 + width] = mask_nodata(tile)
+        print(f"  {region['name']}: rows {min(row0 + tile_size, rows)}/{rows}")
+
+    array.flush()
+    return {
+        "name": region["name"],
+        "file": filename,
+        "west": region["west"],
+        "south": region["south"],
+        "east": region["west"] + cols * resolution_deg,
+        "north": region["north"],
+        "resolution_deg": resolution_deg
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--regions", required=True, help="JSON file listing regions to export")
+    parser.add_argument("--out", required=True, help="Output store directory")
+    parser.add_argument("--year", type=int, default=2023)
+    parser.add_argument("--resolution-deg", type=float, default=0.0001, help="Pixel size in degrees (~11 m at 0.0001)")
+    parser.add_argument("--tile-size", type=int, default=128, help="Pixels per side of each computePixels request")
+    parser.add_argument("--project", default=os.getenv("EE_PROJECT", "pungde-477205"))
+    args = parser.parse_args()
+
+    ee.Initialize(project=args.project)
+    with open(args.regions) as f:
+        regions = json.load(f)
+    os.makedirs(args.out, exist_ok=True)
+
+    image = annual_mosaic(args.year)
+
+    manifest = {
+        "collection": EMBEDDING_COLLECTION,
+        "year": args.year,
+        "bands": EMBEDDING_COLS,
+        "regions": []
+    }
+    for region in regions:
+        print(f"Exporting region '{region['name']}'...")
+        manifest["regions"].append(export_region(image, region, args.resolution_deg, args.tile_size, args.out))
+
+    with open(os.path.join(args.out, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"✅ Wrote {len(regions)} region(s) to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Request-scoped latency instrumentation for the prediction pipeline.
+
+Handlers wrap each pipeline stage in `with instrumentation.stage("geocode"):` and record cache
+outcomes with `instrumentation.cache_lookup("geocode", hit)`. When enabled, stage durations feed
+Prometheus-style histograms served from /metrics, the current request's trace (carried in a
+contextvar) collects per-stage timings for the Server-Timing response header, and an optional
+structured log line is emitted per request. Work shared by several requests (one micro-batch)
+runs through run_shared(), which copies its stage timings onto each request's trace. When
+disabled, stage() returns a shared no-op context manager and cache_lookup() returns after one
+attribute check.
+"""
+import bisect
+import contextlib
+import contextvars
+import json
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger("prediction_service.trace")
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("request_trace", default=None)
+_NULL_STAGE = contextlib.nullcontext()
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...], buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labelvalues, (bucket_counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, bucket_counts):
+                    cumulative += bucket_count
+                    bucket_labels = _format_labels(self.labelnames, labelvalues, 'le="%s"' % bound)
+                    lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+                labels = _format_labels(self.labelnames, labelvalues)
+                inf_labels = _format_labels(self.labelnames, labelvalues, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{inf_labels} {count}")
+                lines.append(f"{self.name}_sum{labels} {total}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labelvalues, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {value}")
+        return lines
+
+class RequestTrace:
+    __slots__ = ("path", "start", "stages", "cache")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.start = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.cache: Dict[str, int] = {}
+
+    def server_timing(self, total: float) -> str:
+        entries = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.stages.items()]
+        entries.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(entries)
+
+class _Stage:
+    __slots__ = ("instrumentation", "name", "start")
+
+    def __init__(self, instrumentation: "Instrumentation", name: str):
+        self.instrumentation = instrumentation
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        self.instrumentation.stage_seconds.observe(seconds, self.name)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.stages[self.name] = trace.stages.get(self.name, 0.0) + seconds
+        return False
+
+class Instrumentation:
+    def __init__(self, enabled: bool = False, trace_logs: bool = False):
+        self.enabled = enabled
+        self.trace_logs = trace_logs
+        self.stage_seconds = Histogram(
+            "prediction_stage_duration_seconds", "Time spent in each prediction pipeline stage.", ("stage",)
+        )
+        self.request_seconds = Histogram(
+            "prediction_request_duration_seconds", "End-to-end request latency.", ("path", "status")
+        )
+        self.cache_lookups = Counter(
+            "prediction_cache_lookups_total", "Cache lookups by cache and result.", ("cache", "result")
+        )
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def cache_lookup(self, cache: str, hit: bool, count: int = 1) -> None:
+        if not self.enabled or count == 0:
+            return
+        result = "hit" if hit else "miss"
+        self.cache_lookups.inc(cache, result, amount=count)
+        trace = _current_trace.get()
+        if trace is not None:
+            key = f"{cache}_{result}"
+            trace.cache[key] = trace.cache.get(key, 0) + count
+
+    def current_trace(self) -> Optional[RequestTrace]:
+        return _current_trace.get() if self.enabled else None
+
+    def add_stage(self, trace: Optional[RequestTrace], name: str, seconds: float) -> None:
+        """
+        Records a stage measured outside the request's own context, e.g. by the micro-batcher.
+        """
+        if not self.enabled:
+            return
+        self.stage_seconds.observe(seconds, name)
+        if trace is not None:
+            trace.stages[name] = trace.stages.get(name, 0.0) + seconds
+
+    def run_shared(self, traces: list, fn, *args):
+        """
+        Runs fn on behalf of several requests and adds the stages it records to each of their
+        traces. The stage histograms see the shared work once.
+        """
+        if not self.enabled:
+            return fn(*args)
+        shared = RequestTrace("")
+        token = _current_trace.set(shared)
+        try:
+            return fn(*args)
+        finally:
+            _current_trace.reset(token)
+            for trace in traces:
+                if trace is not None:
+                    for name, seconds in shared.stages.items():
+                        trace.stages[name] = trace.stages.get(name, 0.0) + seconds
+
+    def start_request(self, path: str):
+        trace = RequestTrace(path)
+        return trace, _current_trace.set(trace)
+
+    def finish_request(self, trace: RequestTrace, token, route: Optional[str], status: int) -> str:
+        """
+        Records the request and returns its Server-Timing header value.
+        """
+        _current_trace.reset(token)
+        total = time.perf_counter() - trace.start
+        self.request_seconds.observe(total, route or "unmatched", str(status))
+        if self.trace_logs:
+            logger.info(json.dumps({
+                "path": trace.path,
+                "status": status,
+                "total_ms": round(total * 1000, 3),
+                "stages_ms": {name: round(seconds * 1000, 3) for name, seconds in trace.stages.items()},
+                "cache": trace.cache
+            }))
+        return trace.server_timing(total)
+
+    def render(self) -> str:
+        lines = self.stage_seconds.render() + self.request_seconds.render() + self.cache_lookups.render()
+        return "\n".join(lines) + "\n"
@@ -1,58 +1,362 @@
+import asyncio
+import contextvars
+import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+import httpx
 import numpy as np
-import requests
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from pydantic import BaseModel
-import pandas as pd
-import xgboost as xgb
-import joblib
-import ee
 from dotenv import load_dotenv
 
+from artifact_bundle import ArtifactBundle
+from batching import MicroBatcher
+from crop_index import CROP_ALIASES, CropIndex
+from embedding_cache import EmbeddingCache
+from ee_sampling import BatchedEmbeddingSampler, EarthEngineBackend
+from embedding_store import EmbeddingTileStore
+from geocode_cache import GeocodeCache, normalize_location
+from instrumentation import Instrumentation
+from predictors import load_predictor
+
 # Load environment variables from .env file
 load_dotenv()
 
+# Set logging
+logger = logging.getLogger(__name__)
+
+# --- Startup Configuration ---
+# "eager" waits for Earth Engine before accepting traffic; "lazy" accepts traffic as soon as the
+# local model artifacts are loaded and initializes Earth Engine in the background.
+STARTUP_MODE = os.getenv("STARTUP_MODE", "eager")
+# How long a request that needs Earth Engine waits for a background initialization to finish.
+EE_INIT_WAIT_SECONDS = float(os.getenv("EE_INIT_WAIT_SECONDS", "30"))
+
+# --- Outbound HTTP Configuration ---
+GEOCODING_URL = os.getenv("GEOCODING_URL", "https://maps.googleapis.com/maps/api/geocode/json")
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "10"))
+HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "5"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+# Geocoding calls one batch request keeps in flight; keep it well below HTTP_MAX_CONNECTIONS so
+# the rest of a large batch waits here instead of timing out on the connection pool.
+GEOCODE_BATCH_CONCURRENCY = int(os.getenv("GEOCODE_BATCH_CONCURRENCY", "20"))
+
+# --- Instrumentation Configuration ---
+# Per-stage timings on /metrics and in the Server-Timing header; TRACE_LOGS adds one structured
+# log line per request.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() in ("1", "true", "yes")
+TRACE_LOGS = os.getenv("TRACE_LOGS", "false").lower() in ("1", "true", "yes")
+
+instrumentation = Instrumentation(enabled=METRICS_ENABLED or TRACE_LOGS, trace_logs=TRACE_LOGS)
+
+# --- Executor Configuration ---
+# Blocking I/O (embedding store, cache and Earth Engine lookups) runs on IO_EXECUTOR_WORKERS
+# threads; scaling and prediction run on CPU_EXECUTOR_WORKERS threads. Each model call uses
+# MODEL_NTHREAD threads, defaulting to an even share of the cores across every uvicorn worker
+# process and CPU thread so that they do not oversubscribe them.
+IO_EXECUTOR_WORKERS = int(os.getenv("IO_EXECUTOR_WORKERS", "16"))
+CPU_EXECUTOR_WORKERS = int(os.getenv("CPU_EXECUTOR_WORKERS", "1"))
+UVICORN_WORKERS = int(os.getenv("UVICORN_WORKERS", "1"))
+MODEL_NTHREAD = int(os.getenv(
+    "MODEL_NTHREAD", str(max(1, (os.cpu_count() or 1) // (UVICORN_WORKERS * CPU_EXECUTOR_WORKERS)))
+))
+
+# --- Geocode Cache Configuration ---
+GEOCODE_CACHE_MAX_ENTRIES = int(os.getenv("GEOCODE_CACHE_MAX_ENTRIES", "10000"))
+GEOCODE_CACHE_TTL_SECONDS = float(os.getenv("GEOCODE_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+# Path to a SQLite file for the persistent tier; leave unset for in-process caching only.
+GEOCODE_CACHE_DB = os.getenv("GEOCODE_CACHE_DB")
+
+geocode_cache = GeocodeCache(
+    max_entries=GEOCODE_CACHE_MAX_ENTRIES,
+    ttl_seconds=GEOCODE_CACHE_TTL_SECONDS,
+    db_path=GEOCODE_CACHE_DB
+)
+
+# Shared connection pool for outbound calls, created in the app lifespan.
+http_client: Optional[httpx.AsyncClient] = None
+
+# Process-wide pools: they outlive any one app lifespan (tests and reloads start several), so
+# they are not shut down with it.
+io_executor = ThreadPoolExecutor(max_workers=IO_EXECUTOR_WORKERS, thread_name_prefix="io")
+cpu_executor = ThreadPoolExecutor(max_workers=CPU_EXECUTOR_WORKERS, thread_name_prefix="cpu")
+
+# The request context (including its trace) is carried into the worker thread.
+async def run_io(fn, *args):
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(io_executor, context.run, fn, *args)
+
+async def run_cpu(fn, *args):
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(cpu_executor, context.run, fn, *args)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global http_client
+    http_client = httpx.AsyncClient(
+        timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS),
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS
+        )
+    )
+    loop = asyncio.get_running_loop()
+    try:
+        try:
+            await loop.run_in_executor(None, load_artifacts)
+        except FileNotFoundError as e:
+            raise RuntimeError(f"FATAL: A required model asset was not found. Ensure 'assets' folder is correct. {e}")
+        except Exception as e:
+            raise RuntimeError(f"FATAL: An error occurred during initialization. {e}")
+
+        ee_init = loop.run_in_executor(None, init_earth_engine)
+        if STARTUP_MODE != "lazy":
+            await ee_init
+            if ee_error is not None:
+                raise RuntimeError(f"FATAL: An error occurred during initialization. {ee_error}")
+
+        if predict_batcher is not None:
+            await predict_batcher.start()
+        try:
+            yield
+        finally:
+            if predict_batcher is not None:
+                await predict_batcher.stop()
+            if embedding_sampler is not None:
+                embedding_sampler.shutdown()
+    finally:
+        # Also reached when startup fails part way, so the pool is never leaked.
+        await http_client.aclose()
+        http_client = None
+
 # --- Application Setup ---
 app = FastAPI(
     title="Crop Yield Prediction Service",
     description="A service that predicts crop yield using a pre-trained XGBoost model and live Google Earth Engine data.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+if METRICS_ENABLED or TRACE_LOGS:
+    @app.middleware("http")
+    async def record_request_timing(request: Request, call_next):
+        trace, token = instrumentation.start_request(request.url.path)
+        try:
+            response = await call_next(request)
+        except Exception:
+            instrumentation.finish_request(trace, token, getattr(request.scope.get("route"), "path", None), 500)
+            raise
+        route = getattr(request.scope.get("route"), "path", None)
+        response.headers["Server-Timing"] = instrumentation.finish_request(trace, token, route, response.status_code)
+        return response
+
+if METRICS_ENABLED:
+    @app.get("/metrics")
+    async def metrics():
+        """
+        Prometheus text exposition of stage and request latency histograms and cache counters.
+        """
+        return Response(content=instrumentation.render(), media_type="text/plain; version=0.0.4")
+
 # --- Define the precise column order from training ---
 # This is critical for ensuring consistency between training and inference.
 REQUIREMENT_COLS = ['N', 'P', 'K', 'temperature', 'humidity', 'ph', 'rainfall']
 EMBEDDING_COLS = [f'A{i:02d}' for i in range(64)]
 FEATURE_COLS = REQUIREMENT_COLS + EMBEDDING_COLS
 
+EMBEDDING_COLLECTION = 'GOOGLE/SATELLITE_EMBEDDING/V1/ANNUAL'
+# Default embedding year, and the annual images available in the collection.
+EMBEDDING_YEAR = int(os.getenv("EMBEDDING_YEAR", "2023"))
+EMBEDDING_MIN_YEAR = int(os.getenv("EMBEDDING_MIN_YEAR", "2017"))
+EMBEDDING_MAX_YEAR = int(os.getenv("EMBEDDING_MAX_YEAR", "2024"))
+
+# Directory of a local embedding store built by ingest_embeddings.py; unset to always use Earth Engine.
+EMBEDDING_STORE_DIR = os.getenv("EMBEDDING_STORE_DIR")
+
+# --- Embedding Cache Configuration ---
+EMBEDDING_CACHE_MAX_BYTES = int(os.getenv("EMBEDDING_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+EMBEDDING_CACHE_GRID_DEG = float(os.getenv("EMBEDDING_CACHE_GRID_DEG", "0.0001"))
+# Snapshot written by warm_embedding_cache.py, loaded at startup.
+EMBEDDING_CACHE_SNAPSHOT = os.getenv("EMBEDDING_CACHE_SNAPSHOT")
+
+embedding_cache = EmbeddingCache(max_bytes=EMBEDDING_CACHE_MAX_BYTES, grid_deg=EMBEDDING_CACHE_GRID_DEG)
+
+# --- Earth Engine Sampling Configuration ---
+# "earthengine" for live sampling, or "fake" for the offline stand-in in fakes/fake_earth_engine.py.
+EE_BACKEND = os.getenv("EE_BACKEND", "earthengine")
+GEE_BATCH_SIZE = int(os.getenv("GEE_BATCH_SIZE", "1000"))
+GEE_MAX_WORKERS = int(os.getenv("GEE_MAX_WORKERS", "4"))
+
+# --- Artifact Bundle Configuration ---
+# Directory written by export_bundle.py. When set, the model, scaler parameters and crop vectors
+# load from the bundle instead of the JSON model, scalers.joblib and the CSV.
+ARTIFACT_BUNDLE_DIR = os.getenv("ARTIFACT_BUNDLE_DIR")
+
+# --- Serving Backend Configuration ---
+# "xgboost" runs the Booster directly; "treelite" loads a library built by compile_model.py.
+PREDICTION_BACKEND = os.getenv("PREDICTION_BACKEND", "xgboost")
+PREDICTOR_LIBRARY = os.getenv("PREDICTOR_LIBRARY", "assets/yield_predictor.so")
+
+# --- Micro-batching Configuration ---
+# Coalesce rows from concurrent /predict and /rank calls into one model call.
+PREDICT_BATCHING = os.getenv("PREDICT_BATCHING", "true").lower() in ("1", "true", "yes")
+PREDICT_BATCH_MAX_ROWS = int(os.getenv("PREDICT_BATCH_MAX_ROWS", "256"))
+PREDICT_BATCH_MAX_WAIT_MS = float(os.getenv("PREDICT_BATCH_MAX_WAIT_MS", "2"))
+
+# Upper bound on the number of items accepted by a single batch request.
+MAX_BATCH_ITEMS = int(os.getenv("MAX_BATCH_ITEMS", "5000"))
+
 # --- Load Artifacts at Startup ---
-try:
-    # Load the trained XGBoost model
-    model = xgb.Booster()
-    model.load_model('assets/xgboost_yield_model.json')
+# Populated by load_artifacts() and init_earth_engine() from the app lifespan, so importing this
+# module stays cheap and heavy libraries are only imported while the artifacts load.
+model = None
+predictor = None
+req_scaler = None
+emb_scaler = None
+yield_scaler = None
+crop_vectors_df = None
+crop_index: Optional[CropIndex] = None
+emb_mean: Optional[np.ndarray] = None
+emb_scale: Optional[np.ndarray] = None
+embedding_store: Optional[EmbeddingTileStore] = None
+embedding_sampler: Optional[BatchedEmbeddingSampler] = None
+ee_ready = threading.Event()
+ee_error: Optional[Exception] = None
+
+def _load_model(source='assets/xgboost_yield_model.json'):
+    # The compiled library is self-contained, so the treelite backend never loads the Booster
+    # (or imports xgboost, which pulls in pandas and sklearn when they are installed).
+    if PREDICTION_BACKEND == "treelite":
+        return None, load_predictor(PREDICTION_BACKEND, None, PREDICTOR_LIBRARY, nthread=MODEL_NTHREAD)
+
+    import xgboost as xgb
+
+    booster = xgb.Booster()
+    booster.load_model(source)
+    booster.set_param({"nthread": MODEL_NTHREAD})
+    return booster, load_predictor(PREDICTION_BACKEND, booster, PREDICTOR_LIBRARY, nthread=MODEL_NTHREAD)
+
+def _load_scalers():
+    import joblib
+
+    return joblib.load('assets/scalers.joblib')
+
+def _load_crop_vectors():
+    import pandas as pd
+
+    return pd.read_csv('assets/crop_requirement_vectors.csv').set_index('canonical_name')
+
+def _open_embedding_store():
+    if not EMBEDDING_STORE_DIR:
+        return None
+    store = EmbeddingTileStore.open(EMBEDDING_STORE_DIR)
+    if store.collection != EMBEDDING_COLLECTION:
+        raise ValueError(f"Embedding store holds {store.collection}, expected {EMBEDDING_COLLECTION}.")
+    return store
+
+def load_artifacts():
+    """
+    Loads the model, scalers, crop vectors, embedding store and cache snapshot in parallel and
+    builds the precomputed inference state.
+    """
+    global model, predictor, req_scaler, emb_scaler, yield_scaler, crop_vectors_df
+    global crop_index, emb_mean, emb_scale, embedding_store
+
+    with ThreadPoolExecutor(max_workers=5, thread_name_prefix="startup") as pool:
+        store_future = pool.submit(_open_embedding_store)
+        # Pre-warm the embedding cache, if a snapshot is configured
+        snapshot_future = pool.submit(embedding_cache.load, EMBEDDING_CACHE_SNAPSHOT) if EMBEDDING_CACHE_SNAPSHOT else None
+
+        if ARTIFACT_BUNDLE_DIR:
+            bundle = ArtifactBundle.open(ARTIFACT_BUNDLE_DIR)
+            if bundle.manifest["feature_cols"] != FEATURE_COLS:
+                raise ValueError("Artifact bundle feature columns do not match the service's FEATURE_COLS.")
+            model_future = pool.submit(_load_model, bundle.model_path)
+        else:
+            model_future = pool.submit(_load_model)
+            scalers_future = pool.submit(_load_scalers)
+            crops_future = pool.submit(_load_crop_vectors)
+
+        model, predictor = model_future.result()
+        embedding_store = store_future.result()
+        if snapshot_future is not None:
+            snapshot_future.result()
+
+        if ARTIFACT_BUNDLE_DIR:
+            # The scaler parameters and requirement matrix are read straight from arrays.bin, so
+            # scalers.joblib is not unpickled and the crop CSV is not parsed.
+            crops = bundle.manifest["crops"]
+            requirements = bundle["crop_requirements"]
+            crop_index = CropIndex(
+                crops["canonical_name"],
+                list(zip(crops["kaggle_name"], crops["spam_code"])),
+                requirements,
+                REQUIREMENT_COLS,
+                (requirements - bundle["req_mean"]) / bundle["req_scale"]
+            )
+            emb_mean = bundle["emb_mean"]
+            emb_scale = bundle["emb_scale"]
+            return
+
+        scalers = scalers_future.result()
+        crop_vectors_df = crops_future.result()
 
-    # Load the pre-fitted scalers
-    scalers = joblib.load('assets/scalers.joblib')
     req_scaler = scalers['req']
     emb_scaler = scalers['emb']
     yield_scaler = scalers['yield']
 
-    # Load crop requirement vectors
-    crop_vectors_df = pd.read_csv('assets/crop_requirement_vectors.csv').set_index('canonical_name')
+    # Precompute the fast inference path: every crop's requirement row is scaled once and frozen
+    # in crop_index, and the raw embedding scaler parameters are kept so requests never go
+    # through pandas or sklearn.
+    crop_index = CropIndex.from_dataframe(
+        crop_vectors_df,
+        REQUIREMENT_COLS,
+        req_scaler.transform(crop_vectors_df[REQUIREMENT_COLS])
+    )
+    emb_mean = np.asarray(emb_scaler.mean_ if emb_scaler.mean_ is not None else np.zeros(len(EMBEDDING_COLS)), dtype=np.float64)
+    emb_scale = np.asarray(emb_scaler.scale_ if emb_scaler.scale_ is not None else np.ones(len(EMBEDDING_COLS)), dtype=np.float64)
 
-    # Initialize Earth Engine
-    EE_PROJECT = os.getenv("EE_PROJECT", "pungde-477205")
-    ee.Initialize(project=EE_PROJECT)
+def init_earth_engine():
+    """
+    Initializes Earth Engine and the batched sampler. Errors are recorded in ee_error rather
+    than raised, so a background initialization can be reported by /readyz.
+    """
+    global embedding_sampler, ee_error
+    try:
+        if EE_BACKEND == "fake":
+            from fakes.fake_earth_engine import FakeEarthEngineBackend
+            ee_backend = FakeEarthEngineBackend()
+        else:
+            import ee
 
-except FileNotFoundError as e:
-    raise RuntimeError(f"FATAL: A required model asset was not found. Ensure 'assets' folder is correct. {e}")
-except Exception as e:
-    raise RuntimeError(f"FATAL: An error occurred during initialization. {e}")
+            EE_PROJECT = os.getenv("EE_PROJECT", "pungde-477205")
+            ee.Initialize(project=EE_PROJECT)
+            ee_backend = EarthEngineBackend(EMBEDDING_COLLECTION)
+        embedding_sampler = BatchedEmbeddingSampler(ee_backend, batch_size=GEE_BATCH_SIZE, max_workers=GEE_MAX_WORKERS)
+    except Exception as e:
+        ee_error = e
+        logger.error(f"❌ Earth Engine initialization failed: {e}")
+    finally:
+        ee_ready.set()
 
 # --- API Data Models ---
 class PredictionRequest(BaseModel):
     crop_name: str
     location_name: str
+    year: Optional[int] = None
+    start_year: Optional[int] = None
+    end_year: Optional[int] = None
+
+class YearlyYield(BaseModel):
+    year: int
+    predicted_yield_tons_per_hectare: Optional[float] = None
 
 class PredictionResponse(BaseModel):
     status: str
@@ -63,12 +367,75 @@ class PredictionResponse(BaseModel):
     crop_name: str
     crop_requirements: dict
     notes: str
+    year: int
+    yield_series: Optional[List[YearlyYield]] = None
+
+class BatchPredictionItem(BaseModel):
+    crop_name: str
+    location_name: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    year: Optional[int] = None
+
+class BatchPredictionRequest(BaseModel):
+    items: List[BatchPredictionItem]
+
+class BatchPredictionResult(BaseModel):
+    index: int
+    status: str
+    crop_name: str
+    predicted_yield_tons_per_hectare: Optional[float] = None
+    location_details: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    error_message: Optional[str] = None
+
+class BatchPredictionResponse(BaseModel):
+    status: str
+    total_items: int
+    successful_items: int
+    results: List[BatchPredictionResult]
+    notes: str
+
+class RankRequest(BaseModel):
+    location_name: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    year: Optional[int] = None
+
+class RankedCrop(BaseModel):
+    rank: int
+    crop_name: str
+    predicted_yield_tons_per_hectare: float
+    crop_requirements: dict
+
+class RankResponse(BaseModel):
+    status: str
+    location_details: Optional[str] = None
+    latitude: float
+    longitude: float
+    rankings: List[RankedCrop]
+    notes: str
+    year: int
 
 # --- API Endpoint ---
-def geocode_location(location_name: str):
+class LocationResult:
+    def __init__(self, lat, lng, address):
+        self.latitude = lat
+        self.longitude = lng
+        self.address = address
+
+async def geocode_location(location_name: str):
     """
-    Google Geocoding API using direct REST API calls
+    Google Geocoding API using direct REST API calls over the shared async connection pool.
+    Successful lookups are served from geocode_cache on repeat. Returns None when the address
+    matches nothing; any other geocoder failure (quota, denied key) raises a 502 or 503.
     """
+    cached = await run_io(geocode_cache.get, location_name)
+    instrumentation.cache_lookup("geocode", cached is not None)
+    if cached:
+        return LocationResult(*cached)
+
     api_key = os.getenv("GOOGLE_GEOCODING_API_KEY")
     if not api_key:
         raise HTTPException(
@@ -76,15 +443,13 @@ def geocode_location(location_name: str):
             detail="Google Geocoding API key not configured. Please set GOOGLE_GEOCODING_API_KEY environment variable."
         )
     
-    # Google Geocoding API endpoint
-    url = "https://maps.googleapis.com/maps/api/geocode/json"
     params = {
         "address": location_name,
         "key": api_key
     }
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = await http_client.get(GEOCODING_URL, params=params)
         response.raise_for_status()
         
         data = response.json()
@@ -94,19 +459,25 @@ def geocode_location(location_name: str):
             lat = result["geometry"]["location"]["lat"]
             lng = result["geometry"]["location"]["lng"]
             address = result["formatted_address"]
-            
-            # Create a simple object to match the expected interface
-            class LocationResult:
-                def __init__(self, lat, lng, address):
-                    self.latitude = lat
-                    self.longitude = lng
-                    self.address = address
-            
+
+            await run_io(geocode_cache.put, location_name, (lat, lng, address))
             return LocationResult(lat, lng, address)
-        
-        return None
-        
-    except requests.RequestException as e:
+
+        if data["status"] in ("OK", "ZERO_RESULTS"):
+            return None
+
+        # OVER_QUERY_LIMIT and UNKNOWN_ERROR are transient; REQUEST_DENIED and INVALID_REQUEST are not.
+        detail = f"Geocoding failed with status {data['status']}"
+        if data.get("error_message"):
+            detail += f": {data['error_message']}"
+        raise HTTPException(
+            status_code=503 if data["status"] in ("OVER_QUERY_LIMIT", "UNKNOWN_ERROR") else 502,
+            detail=detail
+        )
+
+    except HTTPException:
+        raise
+    except httpx.HTTPError as e:
         raise HTTPException(
             status_code=500, 
             detail=f"Geocoding request failed: {str(e)}"
@@ -117,14 +488,206 @@ def geocode_location(location_name: str):
             detail=f"Geocoding error: {str(e)}"
         )
 
+def resolve_crop(crop_name: str) -> int:
+    """
+    Returns the crop_index row for a crop name or alias, or raises a 404.
+    """
+    crop_row = crop_index.resolve(crop_name)
+    if crop_row is None:
+        raise HTTPException(
+            status_code=404, 
+            detail=f"Data for crop '{crop_name}' is not available. Available crops: {crop_index.available_crops}"
+        )
+    return crop_row
+
+def resolve_year(year: Optional[int]) -> int:
+    """
+    Returns the requested embedding year, or the default, or raises a 422.
+    """
+    if year is None:
+        return EMBEDDING_YEAR
+    if not EMBEDDING_MIN_YEAR <= year <= EMBEDDING_MAX_YEAR:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Environmental data is available for {EMBEDDING_MIN_YEAR}-{EMBEDDING_MAX_YEAR}; got {year}."
+        )
+    return year
+
+def environmental_data_note(year: int) -> str:
+    return f"Prediction based on {year}-{year + 1} environmental data."
+
+def fetch_embeddings(points: list) -> list:
+    """
+    Returns the 64-band satellite embedding for each (lat, lon, year) in points, or an
+    HTTPException in its place where no data exists. Points covered by the local embedding
+    store are read from it directly and embedding_cache is checked next; all remaining points,
+    across every year, are sampled from Earth Engine together in batched round trips.
+    """
+    vectors = [None] * len(points)
+    missing = []
+    store_hits = store_misses = 0
+    for i, (lat, lon, year) in enumerate(points):
+        if embedding_store is not None and embedding_store.year == year:
+            stored_vector = embedding_store.lookup(lat, lon)
+            if stored_vector is not None:
+                vectors[i] = stored_vector
+                store_hits += 1
+                continue
+            store_misses += 1
+
+        cached_vector = embedding_cache.get(EMBEDDING_COLLECTION, year, lat, lon)
+        if cached_vector is not None:
+            vectors[i] = cached_vector
+            continue
+
+        missing.append((i, lat, lon, year))
+
+    instrumentation.cache_lookup("embedding_store", True, store_hits)
+    instrumentation.cache_lookup("embedding_store", False, store_misses)
+    instrumentation.cache_lookup("embedding", True, len(points) - store_hits - len(missing))
+    instrumentation.cache_lookup("embedding", False, len(missing))
+    if missing:
+        if not ee_ready.wait(EE_INIT_WAIT_SECONDS):
+            raise HTTPException(status_code=503, detail="Earth Engine is still initializing. Please retry shortly.")
+        if ee_error is not None:
+            raise HTTPException(status_code=503, detail=f"Earth Engine is unavailable: {ee_error}")
+
+        sampled = embedding_sampler.sample(missing)
+        for i, lat, lon, year in missing:
+            environmental_vector_list = sampled.get(i)
+            if environmental_vector_list is None:
+                vectors[i] = HTTPException(
+                    status_code=404, 
+                    detail="No environmental data found for the specified location. This area may be remote or over a large body of water."
+                )
+                continue
+            embedding_cache.put(EMBEDDING_COLLECTION, year, lat, lon, environmental_vector_list)
+            vectors[i] = environmental_vector_list
+    return vectors
+
+def fetch_embedding(lat: float, lon: float, year: int = EMBEDDING_YEAR) -> list:
+    """
+    Returns the 64-band satellite embedding at a single point, or raises a 404.
+    """
+    environmental_vector_list = fetch_embeddings([(lat, lon, year)])[0]
+    if isinstance(environmental_vector_list, HTTPException):
+        raise environmental_vector_list
+    return environmental_vector_list
+
+# Per-thread scratch buffers reused across predictions, grown on demand.
+_buffers = threading.local()
+
+def _feature_buffers(n_rows: int):
+    features = getattr(_buffers, "features", None)
+    if features is None or features.shape[0] < n_rows:
+        capacity = max(n_rows, 16)
+        _buffers.features = np.empty((capacity, len(FEATURE_COLS)), dtype=np.float32)
+        _buffers.embeddings = np.empty((capacity, len(EMBEDDING_COLS)), dtype=np.float64)
+    return _buffers.features[:n_rows], _buffers.embeddings[:n_rows]
+
+def predict_rows(crop_rows: list, environmental_vectors: list) -> np.ndarray:
+    """
+    Assembles one scaled feature row per (crop row, embedding) pair into a reusable float32
+    buffer and runs a single predictor call (Booster.inplace_predict by default) over the whole
+    matrix. Requirement rows come precomputed from startup; embeddings are scaled with the
+    scaler's raw mean/scale arrays.
+    """
+    with instrumentation.stage("scaling"):
+        features, embeddings = _feature_buffers(len(crop_rows))
+        n_req = len(REQUIREMENT_COLS)
+
+        np.take(crop_index.scaled_requirements, crop_rows, axis=0, out=features[:, :n_req])
+
+        # Scale in float64 like StandardScaler.transform, then narrow into the float32 buffer.
+        if isinstance(environmental_vectors, np.ndarray):
+            embeddings[:] = environmental_vectors
+        else:
+            for row, vector in enumerate(environmental_vectors):
+                embeddings[row] = vector
+        np.subtract(embeddings, emb_mean, out=embeddings)
+        np.divide(embeddings, emb_scale, out=embeddings)
+        features[:, n_req:] = embeddings
+
+    with instrumentation.stage("prediction"):
+        return predictor.predict(features)
+
+predict_batcher = MicroBatcher(
+    predict_rows,
+    max_batch_rows=PREDICT_BATCH_MAX_ROWS,
+    max_wait_ms=PREDICT_BATCH_MAX_WAIT_MS,
+    executor=cpu_executor,
+    instrumentation=instrumentation
+) if PREDICT_BATCHING else None
+
+async def predict_rows_async(crop_rows: list, environmental_vectors: list) -> np.ndarray:
+    """
+    Runs predict_rows on the CPU executor, through the micro-batcher when batching is enabled
+    so rows from concurrent requests share one model call.
+    """
+    if predict_batcher is None:
+        return await run_cpu(predict_rows, crop_rows, environmental_vectors)
+    return await predict_batcher.predict(crop_rows, environmental_vectors)
+
+@app.get("/healthz")
+async def healthz():
+    """
+    Liveness: the process is up and serving HTTP.
+    """
+    return {"status": "ok"}
+
+@app.get("/readyz")
+async def readyz(response: Response):
+    """
+    Readiness: the model is loaded before the app starts serving, so this reports Earth Engine
+    status. A failed Earth Engine is never ready (503). While it initializes, lazy mode is ready,
+    since cached and locally stored embeddings can be served; eager mode is not.
+    """
+    if not ee_ready.is_set():
+        earth_engine = "initializing"
+    elif ee_error is not None:
+        earth_engine = "failed"
+    else:
+        earth_engine = "ready"
+    ready = earth_engine == "ready" or (earth_engine == "initializing" and STARTUP_MODE == "lazy")
+    if not ready:
+        response.status_code = 503
+    return {"status": "ready" if ready else "not_ready", "model": "ready", "earth_engine": earth_engine}
+
+@app.get("/crops")
+async def crops():
+    """
+    Lists the supported crops with the aliases each one is also accepted under.
+    """
+    return {"crops": {name: list(CROP_ALIASES.get(name, [])) for name in crop_index.names}}
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """
+    Reports size and hit/miss counters for the service caches.
+    """
+    return {"geocode": geocode_cache.stats(), "embedding": embedding_cache.stats()}
+
 @app.post("/predict", response_model=PredictionResponse)
 async def predict_yield(request: PredictionRequest):
     """
     Accepts a crop and location, fetches live environmental data, and returns a predicted crop yield.
+    With start_year and end_year, also returns a per-year yield series computed from all annual
+    embeddings fetched in one batched call and predicted in one stacked model call.
     """
     try:
+        year = resolve_year(request.year)
+        series_years = []
+        if request.start_year is not None or request.end_year is not None:
+            if request.start_year is None or request.end_year is None or request.start_year > request.end_year:
+                raise HTTPException(
+                    status_code=422,
+                    detail="A yield series needs both start_year and end_year, with start_year <= end_year."
+                )
+            series_years = [resolve_year(y) for y in range(request.start_year, request.end_year + 1)]
+
         # Step 1: Enhanced Geocoding
-        location = geocode_location(request.location_name)
+        with instrumentation.stage("geocode"):
+            location = await geocode_location(request.location_name)
         if not location:
             raise HTTPException(
                 status_code=404, 
@@ -134,67 +697,39 @@ async def predict_yield(request: PredictionRequest):
         lat, lon = location.latitude, location.longitude
 
         # Step 2: Crop Vector Lookup
-        crop_name_lower = request.crop_name.lower()
-        if crop_name_lower not in crop_vectors_df.index:
-            available_crops = ", ".join(crop_vectors_df.index.tolist())
-            raise HTTPException(
-                status_code=404, 
-                detail=f"Data for crop '{request.crop_name}' is not available. Available crops: {available_crops}"
-            )
-        
-        requirement_vector = crop_vectors_df.loc[[crop_name_lower]][REQUIREMENT_COLS]
-        
-        # Extract crop requirements as a dictionary for the response
-        crop_requirements_dict = crop_vectors_df.loc[crop_name_lower][REQUIREMENT_COLS].to_dict()
-
-        # Step 3: Earth Engine Environmental Data
-        point = ee.Geometry.Point(lon, lat)
-        image = ee.ImageCollection('GOOGLE/SATELLITE_EMBEDDING/V1/ANNUAL') \
-                  .filterDate('2023-01-01', '2024-01-01') \
-                  .select(EMBEDDING_COLS) \
-                  .filterBounds(point) \
-                  .first()
-
-        if not image:
-            raise HTTPException(
-                status_code=404, 
-                detail="No environmental data found for the specified location. This area may be remote or over a large body of water."
-            )
-        
-        embedding_dict = image.sample(point, 10).first().toDictionary().getInfo()
-        environmental_vector_list = [embedding_dict.get(band) for band in EMBEDDING_COLS]
-        
-        if None in environmental_vector_list:
-            raise HTTPException(
-                status_code=500, 
-                detail="Failed to retrieve complete environmental vector from Earth Engine."
-            )
+        with instrumentation.stage("crop_lookup"):
+            crop_row = resolve_crop(request.crop_name)
 
-        embedding_vector = pd.DataFrame([environmental_vector_list], columns=EMBEDDING_COLS)
+        # Step 3: Earth Engine Environmental Data, every requested year in one batched call
+        years = [year] + [y for y in series_years if y != year]
+        with instrumentation.stage("embedding"):
+            environmental_vectors = await run_io(fetch_embeddings, [(lat, lon, y) for y in years])
+        if isinstance(environmental_vectors[0], HTTPException):
+            raise environmental_vectors[0]
+        available = [(y, v) for y, v in zip(years, environmental_vectors) if not isinstance(v, HTTPException)]
 
-        # Step 4: Feature Scaling and Assembly
-        scaled_req_features = req_scaler.transform(requirement_vector)
-        scaled_emb_features = emb_scaler.transform(embedding_vector)
-        
-        full_feature_vector = pd.DataFrame(
-            data=np.concatenate([scaled_req_features, scaled_emb_features], axis=1),
-            columns=FEATURE_COLS
-        )
-        
-        # Step 5: Prediction
-        dmatrix = xgb.DMatrix(full_feature_vector)
-        prediction = model.predict(dmatrix)
-        final_yield = float(prediction[0])
+        # Step 4 & 5: Feature Scaling, Assembly and Prediction, one row per year
+        predictions = await predict_rows_async([crop_row] * len(available), [v for _, v in available])
+        yields_by_year = {y: round(float(p), 2) for (y, _), p in zip(available, predictions)}
+
+        yield_series = None
+        if series_years:
+            yield_series = [
+                YearlyYield(year=y, predicted_yield_tons_per_hectare=yields_by_year.get(y))
+                for y in series_years
+            ]
 
         return PredictionResponse(
             status="success",
-            predicted_yield_tons_per_hectare=round(final_yield, 2),
+            predicted_yield_tons_per_hectare=yields_by_year[year],
             location_details=location.address,
             latitude=lat,
             longitude=lon,
             crop_name=request.crop_name,
-            crop_requirements=crop_requirements_dict,
-            notes="Prediction based on 2023-2024 environmental data."
+            crop_requirements=crop_index.requirements[crop_row],
+            notes=environmental_data_note(year),
+            year=year,
+            yield_series=yield_series
         )
 
     except HTTPException as http_exc:
@@ -202,3 +737,173 @@ async def predict_yield(request: PredictionRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"An internal server error occurred: {str(e)}")
 
+@app.post("/predict/batch", response_model=BatchPredictionResponse)
+async def predict_yield_batch(request: BatchPredictionRequest):
+    """
+    Scores many crop x location pairs in one call. Geocoding and Earth Engine lookups are
+    deduplicated across items, and all valid rows are scaled and predicted as one matrix.
+    Failures are reported per item instead of failing the whole batch.
+    """
+    if len(request.items) > MAX_BATCH_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch contains {len(request.items)} items; the maximum is {MAX_BATCH_ITEMS}."
+        )
+
+    try:
+        results = [
+            BatchPredictionResult(index=i, status="error", crop_name=item.crop_name)
+            for i, item in enumerate(request.items)
+        ]
+        point_keys = {}
+        located = []
+        pending = []
+
+        # Step 1a: Geocode every distinct location name, GEOCODE_BATCH_CONCURRENCY at a time
+        location_names = {}
+        for item in request.items:
+            if item.location_name and (item.latitude is None or item.longitude is None):
+                location_names.setdefault(normalize_location(item.location_name), item.location_name)
+        geocode_slots = asyncio.Semaphore(GEOCODE_BATCH_CONCURRENCY)
+
+        async def geocode_bounded(name: str):
+            async with geocode_slots:
+                return await geocode_location(name)
+
+        with instrumentation.stage("geocode"):
+            geocoded_results = await asyncio.gather(
+                *(geocode_bounded(name) for name in location_names.values()),
+                return_exceptions=True
+            )
+        geocoded = dict(zip(location_names, geocoded_results))
+
+        for i, item in enumerate(request.items):
+            result = results[i]
+            try:
+                # Step 1b: Resolve coordinates from the item or the geocoded lookup
+                if item.latitude is not None and item.longitude is not None:
+                    lat, lon = item.latitude, item.longitude
+                elif item.location_name:
+                    location = geocoded[normalize_location(item.location_name)]
+                    if isinstance(location, BaseException):
+                        raise location
+                    if not location:
+                        raise HTTPException(
+                            status_code=404,
+                            detail=f"Location '{item.location_name}' could not be found."
+                        )
+                    lat, lon = location.latitude, location.longitude
+                    result.location_details = location.address
+                else:
+                    raise HTTPException(
+                        status_code=422,
+                        detail="Each item needs either location_name or both latitude and longitude."
+                    )
+                result.latitude, result.longitude = lat, lon
+
+                # Step 2: Crop Vector Lookup
+                crop_row = resolve_crop(item.crop_name)
+                year = resolve_year(item.year)
+
+                point_key = (round(lat, 6), round(lon, 6), year)
+                point_keys.setdefault(point_key, (lat, lon, year))
+                located.append((i, crop_row, point_key))
+            except HTTPException as exc:
+                result.error_message = exc.detail
+
+        # Step 3: Earth Engine Environmental Data, once per distinct point in batched round trips
+        with instrumentation.stage("embedding"):
+            embeddings = dict(zip(point_keys, await run_io(fetch_embeddings, list(point_keys.values()))))
+        for i, crop_row, point_key in located:
+            if isinstance(embeddings[point_key], HTTPException):
+                results[i].error_message = embeddings[point_key].detail
+                continue
+            pending.append((i, crop_row, embeddings[point_key]))
+
+        # Step 4 & 5: One scaling pass and one model.predict over every valid row
+        if pending:
+            predictions = await run_cpu(
+                predict_rows,
+                [crop_row for _, crop_row, _ in pending],
+                [vector for _, _, vector in pending]
+            )
+            for (i, _, _), prediction in zip(pending, predictions):
+                results[i].status = "success"
+                results[i].predicted_yield_tons_per_hectare = round(float(prediction), 2)
+
+        return BatchPredictionResponse(
+            status="success",
+            total_items=len(results),
+            successful_items=len(pending),
+            results=results,
+            notes=f"Predictions based on each item's annual environmental data (default year {EMBEDDING_YEAR})."
+        )
+
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"An internal server error occurred: {str(e)}")
+
+@app.post("/rank", response_model=RankResponse)
+async def rank_crops(request: RankRequest):
+    """
+    Answers "what should I grow here?": fetches the environmental embedding for one location once,
+    scores every supported crop against it in a single model.predict, and returns the crops
+    sorted by predicted yield.
+    """
+    try:
+        year = resolve_year(request.year)
+
+        # Step 1: Geocoding (or explicit coordinates)
+        location_details = None
+        if request.latitude is not None and request.longitude is not None:
+            lat, lon = request.latitude, request.longitude
+        elif request.location_name:
+            with instrumentation.stage("geocode"):
+                location = await geocode_location(request.location_name)
+            if not location:
+                raise HTTPException(
+                    status_code=404, 
+                    detail=f"Location '{request.location_name}' could not be found. Try simpler formats like 'City, State' or 'City, Country'."
+                )
+            lat, lon = location.latitude, location.longitude
+            location_details = location.address
+        else:
+            raise HTTPException(
+                status_code=422,
+                detail="Provide either location_name or both latitude and longitude."
+            )
+
+        # Step 2: Earth Engine Environmental Data, fetched once for all crops
+        with instrumentation.stage("embedding"):
+            environmental_vector_list = await run_io(fetch_embedding, lat, lon, year)
+
+        # Step 3, 4 & 5: Pair the embedding with every crop and predict in one pass
+        crop_rows = list(range(len(crop_index)))
+        predictions = await predict_rows_async(crop_rows, [environmental_vector_list] * len(crop_rows))
+
+        order = np.argsort(-predictions, kind="stable")
+        rankings = [
+            RankedCrop(
+                rank=rank,
+                crop_name=crop_index.names[i],
+                predicted_yield_tons_per_hectare=round(float(predictions[i]), 2),
+                crop_requirements=crop_index.requirements[i]
+            )
+            for rank, i in enumerate(order, start=1)
+        ]
+
+        return RankResponse(
+            status="success",
+            location_details=location_details,
+            latitude=lat,
+            longitude=lon,
+            rankings=rankings,
+            notes=environmental_data_note(year),
+            year=year
+        )
+
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"An internal server error occurred: {str(e)}")
@@ -0,0 +1,157 @@
+"""
+Predicts a yield raster for one crop over a bounding box.
+
+The box is divided into a grid of --resolution-deg pixels and processed tile by tile. Each
+tile's embeddings are read in bulk from the local embedding store (EMBEDDING_STORE_DIR) or,
+for pixels it does not cover, from Earth Engine with one computePixels call. The tile is then
+predicted in one vectorized call and written straight into the output raster. Memory use is
+bounded by the tile size, not the region size.
+
+Outputs <out>.npy (float32, NaN where there is no data) or <out>.tif (needs rasterio),
+plus <out>.json with the grid metadata.
+
+Usage:
+    python predict_region.py --crop rice --west 73.4 --south 19.6 --east 74.4 --north 20.6 \\
+        --resolution-deg 0.001 --out nashik_rice
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+import main
+from ee_sampling import annual_mosaic, fetch_pixel_tile, mask_nodata
+
+class NpyRasterWriter:
+    def __init__(self, path: str, rows: int, cols: int):
+        self.path = path
+        self.array = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(rows, cols))
+
+    def write(self, row0: int, col0: int, tile: np.ndarray) -> None:
+        self.array[row0:row0 + tile.shape[0], col0:col0 + tile.shape[1]] = tile
+
+    def close(self) -> None:
+        self.array.flush()
+        del self.array
+
+class GeoTiffRasterWriter:
+    def __init__(self, path: str, rows: int, cols: int, west: float, north: float, resolution_deg: float):
+        import rasterio
+        from rasterio.transform import from_origin
+
+        self._window = rasterio.windows.Window
+        self.dataset = rasterio.open(
+            path, "w", driver="GTiff", height=rows, width=cols, count=1, dtype="float32",
+            crs="EPSG:4326", transform=from_origin(west, north, resolution_deg, resolution_deg),
+            nodata=np.nan, tiled=True, compress="deflate"
+        )
+
+    def write(self, row0: int, col0: int, tile: np.ndarray) -> None:
+        self.dataset.write(tile, 1, window=self._window(col0, row0, tile.shape[1], tile.shape[0]))
+
+    def close(self) -> None:
+        self.dataset.close()
+
+def tile_embeddings(args, image, row0: int, col0: int, height: int, width: int) -> np.ndarray:
+    """
+    Returns the (height * width, 64) embeddings for one tile, NaN where no data is available.
+    """
+    west = args.west + col0 * args.resolution_deg
+    north = args.north - row0 * args.resolution_deg
+    vectors = np.full((height * width, len(main.EMBEDDING_COLS)), np.nan, dtype=np.float32)
+
+    if main.embedding_store is not None and main.embedding_store.year == args.year:
+        # Pixel centers of the output grid.
+        lats = north - (np.arange(height) + 0.5) * args.resolution_deg
+        lons = west + (np.arange(width) + 0.5) * args.resolution_deg
+        lat_grid, lon_grid = np.meshgrid(lats, lons, indexing="ij")
+        vectors = main.embedding_store.lookup_many(lat_grid.ravel(), lon_grid.ravel())
+
+    missing = np.isnan(vectors[:, 0])
+    if image is not None and missing.any():
+        remote = mask_nodata(fetch_pixel_tile(image, west, north, width, height, args.resolution_deg)).reshape(-1, vectors.shape[1])
+        vectors[missing] = remote[missing]
+    return vectors
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--crop", required=True)
+    parser.add_argument("--west", type=float, required=True)
+    parser.add_argument("--south", type=float, required=True)
+    parser.add_argument("--east", type=float, required=True)
+    parser.add_argument("--north", type=float, required=True)
+    parser.add_argument("--resolution-deg", type=float, default=0.001)
+    parser.add_argument("--year", type=int, default=main.EMBEDDING_YEAR)
+    parser.add_argument("--tile-size", type=int, default=256, help="Pixels per side of each processing tile")
+    parser.add_argument("--format", choices=["npy", "tif"], default="npy")
+    parser.add_argument("--no-earth-engine", action="store_true", help="Only use the local embedding store")
+    parser.add_argument("--out", required=True, help="Output path without extension")
+    args = parser.parse_args()
+
+    main.load_artifacts()
+    crop_row = main.crop_index.resolve(args.crop)
+    if crop_row is None:
+        sys.exit(f"Crop '{args.crop}' is not supported. Available crops: {main.crop_index.available_crops}")
+
+    image = None
+    if not args.no_earth_engine:
+        import ee
+
+        ee.Initialize(project=os.getenv("EE_PROJECT", "pungde-477205"))
+        image = annual_mosaic(args.year)
+    elif main.embedding_store is None:
+        sys.exit("--no-earth-engine needs EMBEDDING_STORE_DIR to point at a local embedding store.")
+
+    rows = math.ceil((args.north - args.south) / args.resolution_deg)
+    cols = math.ceil((args.east - args.west) / args.resolution_deg)
+    raster_path = f"{args.out}.{args.format}"
+    if args.format == "tif":
+        writer = GeoTiffRasterWriter(raster_path, rows, cols, args.west, args.north, args.resolution_deg)
+    else:
+        writer = NpyRasterWriter(raster_path, rows, cols)
+
+    start = time.perf_counter()
+    predicted_pixels = 0
+    try:
+        for row0 in range(0, rows, args.tile_size):
+            for col0 in range(0, cols, args.tile_size):
+                height = min(args.tile_size, rows - row0)
+                width = min(args.tile_size, cols - col0)
+                vectors = tile_embeddings(args, image, row0, col0, height, width)
+
+                tile = np.full(height * width, np.nan, dtype=np.float32)
+                valid = np.flatnonzero(~np.isnan(vectors[:, 0]))
+                if len(valid):
+                    tile[valid] = main.predict_rows(np.full(len(valid), crop_row), vectors[valid])
+                    predicted_pixels += len(valid)
+                writer.write(row0, col0, tile.reshape(height, width))
+            print(f"  rows {min(row0 + args.tile_size, rows)}/{rows}")
+    finally:
+        writer.close()
+
+    metadata = {
+        "crop_name": main.crop_index.names[crop_row],
+        "year": args.year,
+        "units": "tons_per_hectare",
+        "crs": "EPSG:4326",
+        "west": args.west,
+        "north": args.north,
+        "east": args.west + cols * args.resolution_deg,
+        "south": args.north - rows * args.resolution_deg,
+        "resolution_deg": args.resolution_deg,
+        "rows": rows,
+        "cols": cols,
+        "nodata": "NaN",
+        "predicted_pixels": predicted_pixels,
+        "raster": os.path.basename(raster_path)
+    }
+    with open(f"{args.out}.json", "w") as f:
+        json.dump(metadata, f, indent=2)
+    print(f"✅ Wrote {raster_path} ({rows}x{cols}, {predicted_pixels} predicted pixels) in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main_cli()
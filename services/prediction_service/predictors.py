@@ -0,0 +1,43 @@
+"""
+Serving backends for the yield model.
+
+Both backends take a C-contiguous float32 feature matrix in FEATURE_COLS order and return one
+prediction per row:
+
+- "xgboost" (default): xgb.Booster.inplace_predict on the JSON model.
+- "treelite": a native shared library compiled from the same JSON model by compile_model.py
+  with treelite + tl2cgen. Requires `pip install treelite tl2cgen` and a C toolchain at build
+  time; the service only needs tl2cgen at runtime.
+"""
+import numpy as np
+
+class XGBoostPredictor:
+    name = "xgboost"
+
+    def __init__(self, booster):
+        self.booster = booster
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        return self.booster.inplace_predict(features)
+
+class TreelitePredictor:
+    name = "treelite"
+
+    def __init__(self, library_path: str, nthread: int = 1):
+        import tl2cgen
+
+        self._tl2cgen = tl2cgen
+        self.predictor = tl2cgen.Predictor(library_path, nthread=nthread)
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        # tl2cgen returns (rows, targets, classes); the yield model has a single output.
+        return self.predictor.predict(self._tl2cgen.DMatrix(features)).reshape(-1)
+
+def load_predictor(backend: str, booster, library_path: str = None, nthread: int = 1):
+    if backend == "xgboost":
+        return XGBoostPredictor(booster)
+    if backend == "treelite":
+        if not library_path:
+            raise ValueError("PREDICTION_BACKEND=treelite requires PREDICTOR_LIBRARY to point at a compiled model.")
+        return TreelitePredictor(library_path, nthread=nthread)
+    raise ValueError(f"Unknown PREDICTION_BACKEND '{backend}'. Expected 'xgboost' or 'treelite'.")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Service modules are imported top-level, as uvicorn main:app does from the service directory.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -0,0 +1,34 @@
+import asyncio
+import time
+
+from batching import MicroBatcher
+
+def _echo(crop_rows, vectors):
+    return list(crop_rows)
+
+def test_lone_request_is_not_delayed():
+    batcher = MicroBatcher(_echo, max_batch_rows=64, max_wait_ms=1000)
+
+    async def one():
+        await batcher.start()
+        start = time.perf_counter()
+        result = await batcher.predict([7], [[0.0]])
+        elapsed = time.perf_counter() - start
+        await batcher.stop()
+        return result, elapsed
+
+    result, elapsed = asyncio.run(one())
+    assert result == [7]
+    assert elapsed < 0.5
+
+def test_queued_requests_share_one_batch():
+    batcher = MicroBatcher(_echo, max_batch_rows=3, max_wait_ms=1000)
+
+    async def many():
+        await batcher.start()
+        results = await asyncio.gather(*(batcher.predict([i], [[0.0]]) for i in range(3)))
+        await batcher.stop()
+        return results
+
+    assert asyncio.run(many()) == [[0], [1], [2]]
+    assert batcher.batches_run == 1
@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+from ee_sampling import BatchedEmbeddingSampler
+from fakes.fake_earth_engine import FakeEarthEngineBackend
+
+def make_points(count: int) -> list:
+    # String ids and mixed years, with every tenth point over NODATA.
+    return [
+        (f"p{i}", 85.0 if i % 10 == 0 else 18.0 + i * 0.01, 73.0 + i * 0.01, 2020 + i % 3)
+        for i in range(count)
+    ]
+
+def per_point(backend, points) -> dict:
+    vectors = {}
+    for point in points:
+        vectors.update(backend.sample([point]))
+    return vectors
+
+def test_batched_sampling_matches_per_point_sampling():
+    points = make_points(250)
+    reference_backend = FakeEarthEngineBackend(latency_ms=0)
+    expected = per_point(reference_backend, points)
+
+    backend = FakeEarthEngineBackend(latency_ms=0)
+    sampler = BatchedEmbeddingSampler(backend, batch_size=100, max_workers=4)
+    try:
+        vectors = sampler.sample(points)
+    finally:
+        sampler.shutdown()
+
+    assert vectors == expected
+    assert sum(vector is None for vector in vectors.values()) == 25
+    assert (reference_backend.calls, backend.calls) == (250, 3)
+    assert backend.points_sampled == 250
+
+def test_chunks_run_concurrently():
+    latency_ms = 100
+    backend = FakeEarthEngineBackend(latency_ms=latency_ms)
+    sampler = BatchedEmbeddingSampler(backend, batch_size=10, max_workers=4)
+    try:
+        start = time.perf_counter()
+        sampler.sample(make_points(40))
+        elapsed = time.perf_counter() - start
+    finally:
+        sampler.shutdown()
+
+    assert backend.calls == 4
+    # Four chunks one after another would take 4 x latency.
+    assert elapsed < 2 * latency_ms / 1000
+
+@pytest.mark.parametrize("points", [[], make_points(1)])
+def test_small_requests_use_at_most_one_call(points):
+    backend = FakeEarthEngineBackend(latency_ms=0)
+    sampler = BatchedEmbeddingSampler(backend, batch_size=100)
+    try:
+        assert len(sampler.sample(points)) == len(points)
+    finally:
+        sampler.shutdown()
+    assert backend.calls == len(points)
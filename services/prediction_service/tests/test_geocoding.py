@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+import main
+from fakes import fake_geocoder
+from geocode_cache import GeocodeCache
+
+LATENCY_SECONDS = 0.2
+
+def test_concurrent_geocoding_runs_in_parallel(monkeypatch):
+    monkeypatch.setattr(fake_geocoder, "LATENCY_MS", LATENCY_SECONDS * 1000)
+    monkeypatch.setattr(main, "GEOCODING_URL", "http://geocoder/maps/api/geocode/json")
+    monkeypatch.setattr(main, "geocode_cache", GeocodeCache())
+    monkeypatch.setenv("GOOGLE_GEOCODING_API_KEY", "fake")
+
+    async def geocode_all(names):
+        transport = httpx.ASGITransport(app=fake_geocoder.app)
+        async with httpx.AsyncClient(transport=transport) as client:
+            monkeypatch.setattr(main, "http_client", client)
+            start = time.perf_counter()
+            results = await asyncio.gather(*(main.geocode_location(name) for name in names))
+            return results, time.perf_counter() - start
+
+    names = [f"Village {i}, Maharashtra" for i in range(10)]
+    results, elapsed = asyncio.run(geocode_all(names))
+
+    assert [r.address for r in results] == [f"{name}, India" for name in names]
+    # Ten lookups in sequence would take 10 x latency; concurrently they overlap.
+    assert elapsed < 3 * LATENCY_SECONDS
+
+def test_repeat_lookup_is_served_from_cache(monkeypatch):
+    monkeypatch.setattr(main, "geocode_cache", GeocodeCache())
+    main.geocode_cache.put("Nashik, Maharashtra", (19.99, 73.79, "Nashik, Maharashtra, India"))
+    # No client is configured, so a cache miss would fail.
+    monkeypatch.setattr(main, "http_client", None)
+
+    result = asyncio.run(main.geocode_location("  nashik maharashtra. "))
+    assert (result.latitude, result.longitude) == (19.99, 73.79)
+
+def test_quota_errors_are_not_reported_as_unknown_places(monkeypatch):
+    monkeypatch.setattr(main, "GEOCODING_URL", "http://geocoder/maps/api/geocode/json")
+    monkeypatch.setattr(main, "geocode_cache", GeocodeCache())
+    monkeypatch.setenv("GOOGLE_GEOCODING_API_KEY", "fake")
+
+    async def geocode(name):
+        transport = httpx.ASGITransport(app=fake_geocoder.app)
+        async with httpx.AsyncClient(transport=transport) as client:
+            monkeypatch.setattr(main, "http_client", client)
+            return await main.geocode_location(name)
+
+    assert asyncio.run(geocode("Nowhere Village")) is None
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(geocode("Overquota Village"))
+    assert exc_info.value.status_code == 503
+    assert "OVER_QUERY_LIMIT" in exc_info.value.detail
@@ -0,0 +1,27 @@
+import asyncio
+import threading
+
+from fastapi import Response
+
+import main
+
+def _readyz(monkeypatch, mode: str, initialized: bool, error=None):
+    ready = threading.Event()
+    if initialized:
+        ready.set()
+    monkeypatch.setattr(main, "STARTUP_MODE", mode)
+    monkeypatch.setattr(main, "ee_ready", ready)
+    monkeypatch.setattr(main, "ee_error", error)
+    response = Response()
+    body = asyncio.run(main.readyz(response))
+    return response.status_code, body
+
+def test_failed_earth_engine_is_not_ready(monkeypatch):
+    status, body = _readyz(monkeypatch, "lazy", initialized=True, error=RuntimeError("no credentials"))
+    assert status == 503
+    assert (body["status"], body["earth_engine"]) == ("not_ready", "failed")
+
+def test_initializing_earth_engine_is_ready_only_in_lazy_mode(monkeypatch):
+    assert _readyz(monkeypatch, "lazy", initialized=False)[0] == 200
+    assert _readyz(monkeypatch, "eager", initialized=False)[0] == 503
+    assert _readyz(monkeypatch, "eager", initialized=True) == (200, {"status": "ready", "model": "ready", "earth_engine": "ready"})
@@ -0,0 +1,53 @@
+"""
+Builds an embedding cache snapshot from a CSV of known farm coordinates.
+
+The CSV needs `latitude` and `longitude` columns. Points are snapped to the cache grid and
+each distinct cell is sampled once from Earth Engine in batched round trips. Load the result in the service with
+EMBEDDING_CACHE_SNAPSHOT=<out>.
+
+Usage:
+    python warm_embedding_cache.py --csv farms.csv --out embedding_cache.npz
+"""
+import argparse
+import os
+
+import ee
+import pandas as pd
+
+from ee_sampling import EMBEDDING_COLLECTION, BatchedEmbeddingSampler, EarthEngineBackend
+from embedding_cache import EmbeddingCache
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", required=True, help="CSV with latitude and longitude columns")
+    parser.add_argument("--out", required=True, help="Output .npz snapshot")
+    parser.add_argument("--year", type=int, default=2023)
+    parser.add_argument("--grid-deg", type=float, default=float(os.getenv("EMBEDDING_CACHE_GRID_DEG", "0.0001")))
+    parser.add_argument("--batch-size", type=int, default=int(os.getenv("GEE_BATCH_SIZE", "1000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("GEE_MAX_WORKERS", "4")))
+    parser.add_argument("--project", default=os.getenv("EE_PROJECT", "pungde-477205"))
+    args = parser.parse_args()
+
+    ee.Initialize(project=args.project)
+    sampler = BatchedEmbeddingSampler(EarthEngineBackend(EMBEDDING_COLLECTION), batch_size=args.batch_size, max_workers=args.workers)
+
+    farms = pd.read_csv(args.csv)
+    cache = EmbeddingCache(max_bytes=2**62, grid_deg=args.grid_deg)
+    cells = {}
+    for lat, lon in zip(farms["latitude"], farms["longitude"]):
+        cells.setdefault(cache.key(EMBEDDING_COLLECTION, args.year, lat, lon), (lat, lon))
+
+    vectors = sampler.sample([(key, lat, lon, args.year) for key, (lat, lon) in cells.items()])
+    failed = 0
+    for key, (lat, lon) in cells.items():
+        if vectors.get(key) is None:
+            failed += 1
+            continue
+        cache.put(EMBEDDING_COLLECTION, args.year, lat, lon, vectors[key])
+    sampler.shutdown()
+
+    cache.save(args.out)
+    print(f"✅ Cached {len(cells) - failed} cell(s) from {len(farms)} farm(s); {failed} without data. Wrote {args.out}")
+
+if __name__ == "__main__":
+    main()